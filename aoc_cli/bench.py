@@ -0,0 +1,123 @@
+# `aoc bench`: rerun every solved day, check the answers against the ones the server accepted (from the
+# submission ledger, or from dayN.answer for days solved before there was a ledger), and compare the timings
+# with the previous bench run.
+# The puzzle directories look like advent-of-code/2023/day12.py, advent-of-code/2023/day12_real.in, ...
+# Each bench run is appended to bench_history.jsonl in the directory it was run from.
+import json
+import os
+import re
+import time
+
+HISTORY_FILENAME = 'bench_history.jsonl'
+# a day regressed if it got this much slower...
+DEFAULT_THRESHOLD = 0.2
+# ...and by at least this many seconds, so that noise on fast days doesn't count
+MIN_REGRESSION_SECONDS = 0.05
+
+def find_year_dirs(root, years):
+    """The (year, directory) pairs to bench. With no years, root itself if it has solutions in it, otherwise every year directory under it."""
+    if not years:
+        if find_days(root):
+            name = os.path.basename(os.path.abspath(root))
+            return [(int(name) if name.isdigit() else None, root)]
+        years = sorted(int(name) for name in os.listdir(root) if re.fullmatch(r'\d{4}', name) and os.path.isdir(os.path.join(root, name)))
+    year_dirs = []
+    for year in years:
+        if os.path.basename(os.path.abspath(root)) == str(year):
+            year_dirs.append((int(year), root))
+        elif os.path.isdir(os.path.join(root, str(year))):
+            year_dirs.append((int(year), os.path.join(root, str(year))))
+        else:
+            raise ValueError(f'no directory for {year} in {os.path.abspath(root)}')
+    return year_dirs
+
+def find_days(directory):
+    """The days in directory that have both a solution and a (non-empty) real input, in order."""
+    days = []
+    for name in os.listdir(directory):
+        match = re.fullmatch(r'day(\d+)\.py', name)
+        if match is None:
+            continue
+        real_path = os.path.join(directory, f'day{match.group(1)}_real.in')
+        if os.path.exists(real_path) and os.path.getsize(real_path) > 0:
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+def known_answers(directory, day):
+    """{level: answer} from dayN.answer in directory, which has part 1's answer on its first line and part 2's
+    on its second (either line can be blank). {} if there's no such file."""
+    try:
+        with open(os.path.join(directory, f'day{day}.answer'), 'r') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return {}
+    return {level: line.strip() for level, line in enumerate(lines[:2], start=1) if line.strip()}
+
+def check_answer(answer, correct):
+    """correct maps level to the accepted answer. Returns 'ok (part N)', 'wrong' or 'unknown'.
+    (A run that failed has no answer, and bench marks it 'failed' without checking.)"""
+    if not correct:
+        return 'unknown'
+    for level, correct_answer in sorted(correct.items()):
+        if answer == correct_answer:
+            return f'ok (part {level})'
+    return 'wrong'
+
+def get_history_path(root):
+    return os.path.join(root, HISTORY_FILENAME)
+
+def previous_bench(root):
+    """The most recent result for each day benched from root, keyed by 'year/day', or {}.
+    Runs can cover different years, so each day's result comes from the latest run that included it."""
+    previous = {}
+    try:
+        with open(get_history_path(root), 'r') as f:
+            for line in f:
+                try:
+                    results = json.loads(line)['results']
+                except (ValueError, KeyError):
+                    continue
+                for result in results:
+                    previous[f"{result['year']}/{result['day']}"] = result
+    except FileNotFoundError:
+        pass
+    return previous
+
+def append_history(root, results):
+    with open(get_history_path(root), 'a') as f:
+        f.write(json.dumps({'time': time.time(), 'results': results}) + '\n')
+
+def mark_regressions(results, previous, threshold):
+    """Set 'previous_wall' and 'regressed' on each result, comparing with the previous bench run."""
+    for result in results:
+        before = previous.get(f"{result['year']}/{result['day']}")
+        result['previous_wall'] = before['wall'] if before is not None and before.get('returncode') == 0 else None
+        result['regressed'] = (
+            result['previous_wall'] is not None
+            and result['returncode'] == 0
+            and result['wall'] > result['previous_wall'] * (1 + threshold)
+            and result['wall'] - result['previous_wall'] >= MIN_REGRESSION_SECONDS
+        )
+
+def format_table(results):
+    header = ['year', 'day', 'answer', 'check', 'wall', 'cpu', 'peak mem', 'vs previous']
+    rows = []
+    for result in results:
+        change = ''
+        if result['previous_wall']:
+            change = f"{(result['wall'] / result['previous_wall'] - 1) * 100:+.0f}%"
+            if result['regressed']:
+                change += ' REGRESSED'
+        rows.append([
+            str(result['year'] or ''),
+            str(result['day']),
+            (result['answer'] or '')[:20],
+            result['check'] if result['failure'] is None else result['failure'],
+            f"{result['wall']:.3f}s",
+            f"{result['utime'] + result['stime']:.3f}s",
+            f"{result['maxrss'] / 2**20:.1f}MB",
+            change,
+        ])
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ['  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [header] + rows]
+    return '\n'.join(lines)
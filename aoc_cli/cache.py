@@ -0,0 +1,98 @@
+# Persistent on-disk cache for things downloaded from adventofcode.com.
+# Bodies are stored by content hash under objects/, and index.json maps
+# (token owner, year, day, resource) to the hash plus the validators (ETag / Last-Modified)
+# needed to revalidate it with a conditional GET.
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+def get_cache_dir():
+    cache_dir = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(cache_dir, 'aoc_cli')
+
+def get_index_path():
+    return os.path.join(get_cache_dir(), 'index.json')
+
+def get_object_path(digest):
+    return os.path.join(get_cache_dir(), 'objects', digest[:2], digest)
+
+def owner_of(token):
+    """Inputs differ per account, so entries are keyed by (a hash of) the session token they were fetched with."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+def make_key(owner, year, day, resource):
+    return f'{owner}/{year}/{day}/{resource}'
+
+# put/revalidated/invalidate read, modify and write the whole index, so threads (e.g. `aoc sync`'s) take turns
+_index_lock = threading.Lock()
+
+def write_atomic(path, data):
+    """Write to a temp file in the same directory and rename it over path, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_index():
+    try:
+        with open(get_index_path(), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_index(index):
+    write_atomic(get_index_path(), json.dumps(index, indent=1).encode())
+
+def get_entry(owner, year, day, resource):
+    """The index entry for the resource, or None if it's not cached (or its body went missing)."""
+    entry = load_index().get(make_key(owner, year, day, resource))
+    if entry is None or not os.path.exists(get_object_path(entry['hash'])):
+        return None
+    return entry
+
+def read_body(entry):
+    with open(get_object_path(entry['hash']), 'rb') as f:
+        return f.read().decode()
+
+def put(owner, year, day, resource, body, etag=None, last_modified=None):
+    data = body.encode()
+    digest = hashlib.sha256(data).hexdigest()
+    if not os.path.exists(get_object_path(digest)):
+        write_atomic(get_object_path(digest), data)
+    with _index_lock:
+        index = load_index()
+        index[make_key(owner, year, day, resource)] = {
+            'hash': digest,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'stale': False,
+        }
+        save_index(index)
+
+def revalidated(owner, year, day, resource):
+    """The server said our copy is still good (304)."""
+    with _index_lock:
+        index = load_index()
+        key = make_key(owner, year, day, resource)
+        if key in index:
+            index[key]['fetched_at'] = time.time()
+            index[key]['stale'] = False
+            save_index(index)
+
+def invalidate(owner, year, day, resource):
+    """Mark the cached copy as stale so the next read revalidates it with the server."""
+    with _index_lock:
+        index = load_index()
+        key = make_key(owner, year, day, resource)
+        if key in index:
+            index[key]['stale'] = True
+            save_index(index)
@@ -0,0 +1,120 @@
+# Captures a solution's stdout and stderr without becoming the bottleneck when it prints a lot.
+# Output is read in large binary chunks. Only a bounded tail is kept in memory (enough to find the answer
+# on the last line), echoing to the terminal stops after echo_limit bytes, and the full stdout can be
+# spooled to a file instead.
+import contextlib
+import os
+import selectors
+import sys
+import time
+
+TAIL_BYTES = 64 * 1024
+CHUNK_BYTES = 64 * 1024
+COALESCE_BYTES = 4096
+COALESCE_SECONDS = 0.001
+# after the output is cut off, show this many of the last lines at the end
+TAIL_LINES_SHOWN = 10
+
+class Capture:
+    def __init__(self, prefix='', echo_limit=None, spool_path=None, lock=None, on_output=None, echo=True):
+        """on_output, if given, is called with the total number of bytes read so far after every chunk.
+        With echo=False nothing is written to the terminal; the output is only captured."""
+        self.prefix = prefix.encode()
+        self.echo = echo
+        self.on_output = on_output
+        self.echo_limit = echo_limit
+        self.spool = open(spool_path, 'wb') if spool_path is not None else None
+        self.spool_path = spool_path
+        self.lock = lock
+        self.tails = {}
+        self.sizes = {}
+        self.echoed = {}
+        # with a prefix, the incomplete last line of each stream, held back so that concurrent runs' lines don't mix
+        self.pending = {}
+
+    def write(self, stream, data):
+        out = sys.stdout if stream == 'stdout' else sys.stderr
+        with self.lock or contextlib.nullcontext():
+            out.flush()
+            out.buffer.write(data)
+            out.buffer.flush()
+
+    def prefixed(self, stream, chunk):
+        """The complete lines so far (including what was held back from earlier chunks), each with the prefix.
+        Without a prefix, the chunk is passed straight through."""
+        if not self.prefix:
+            return chunk
+        data = self.pending.get(stream, b'') + chunk
+        end = data.rfind(b'\n') + 1
+        self.pending[stream] = data[end:]
+        return b''.join(self.prefix + line + b'\n' for line in data[:end].split(b'\n')[:-1])
+
+    def feed(self, stream, chunk):
+        self.sizes[stream] = self.sizes.get(stream, 0) + len(chunk)
+        tail = self.tails.setdefault(stream, bytearray())
+        tail += chunk
+        if len(tail) > TAIL_BYTES:
+            del tail[:len(tail) - TAIL_BYTES]
+        if stream == 'stdout' and self.spool is not None:
+            self.spool.write(chunk)
+        echoed = self.echoed.get(stream, 0)
+        if not self.echo:
+            pass
+        elif self.echo_limit is None or echoed + len(chunk) <= self.echo_limit:
+            self.write(stream, self.prefixed(stream, chunk))
+        elif echoed <= self.echo_limit:
+            # this chunk crosses the limit: show up to the end of its last full line, then stop echoing
+            cut = chunk.rfind(b'\n', 0, max(0, self.echo_limit - echoed)) + 1
+            self.write(stream, self.prefixed(stream, chunk[:cut]))
+            where = f'it is all in {self.spool_path}' if self.spool is not None else 'use --spool to keep all of it'
+            self.write(stream, self.prefix + f'... ({stream} is too long to show; {where})\n'.encode())
+        self.echoed[stream] = echoed + len(chunk)
+        if self.on_output is not None:
+            self.on_output(sum(self.sizes.values()))
+
+    def read_all(self, popen):
+        """Read popen's stdout and stderr until both are closed."""
+        selector = selectors.DefaultSelector()
+        for stream in ['stdout', 'stderr']:
+            pipe = getattr(popen, stream)
+            if pipe is not None:
+                selector.register(pipe.fileno(), selectors.EVENT_READ, stream)
+        while selector.get_map():
+            for key, _ in selector.select():
+                chunk = os.read(key.fd, CHUNK_BYTES)
+                if chunk:
+                    self.feed(key.data, chunk)
+                    if len(chunk) < COALESCE_BYTES:
+                        # `python -u` writes every print separately. rather than waking up for each one,
+                        # give the solution a moment to fill the pipe
+                        time.sleep(COALESCE_SECONDS)
+                else:
+                    selector.unregister(key.fd)
+        selector.close()
+        self.close()
+
+    def truncated(self, stream='stdout'):
+        """Whether the echo of the stream was cut off (in which case close() shows its last lines)."""
+        return self.echo_limit is not None and self.echoed.get(stream, 0) > self.echo_limit
+
+    def close(self):
+        if self.spool is not None:
+            self.spool.close()
+        if not self.echo:
+            return
+        for stream in self.echoed:
+            if self.truncated(stream):
+                lines = self.tail_lines(stream)[-TAIL_LINES_SHOWN:]
+                self.write(stream, self.prefix + f'... last {len(lines)} lines of {self.sizes[stream]} bytes:\n'.encode())
+                self.write(stream, b''.join(self.prefix + line.rstrip('\n').encode() + b'\n' for line in lines))
+            elif self.pending.get(stream):
+                self.write(stream, self.prefix + self.pending[stream] + b'\n')
+
+    def tail_lines(self, stream='stdout'):
+        """The last lines of the stream (as much as fits in the tail buffer), with their line endings."""
+        tail = bytes(self.tails.get(stream, b''))
+        lines = tail.decode(errors='replace').splitlines(keepends=True)
+        if self.sizes.get(stream, 0) > len(tail) and lines:
+            # the first line was cut off by the tail buffer
+            lines = lines[1:]
+        return lines
@@ -1,36 +1,87 @@
 import argparse
+import datetime
+import time
 import os
 import shutil
 import json
-import requests
-import subprocess
-from bs4 import BeautifulSoup
+import threading
+import glob
+import contextlib
+import signal
+
+from aoc_cli import cache, ledger
+
+# Heavy imports (requests, bs4, asyncio, openai, the forkserver) are done inside the functions that use them,
+# so that commands like `aoc day 12` start fast. See aoc_cli/startup_benchmark.py.
 
 BASE_URL = 'https://adventofcode.com'
-session = requests.Session()
-session.headers.update({'User-Agent': 'kevinwang wang-aoc-cli https://github.com/VitamintK/wang-aoc-cli'})
+# below this, the heuristic example parser defers to the LLM
+HEURISTIC_CONFIDENCE = 0.75
+# stop echoing a solution's output to the terminal after this many bytes (the `echo_limit` config key overrides it)
+DEFAULT_ECHO_LIMIT = 2**20
+# what solutions run with, unless `aoc race` found a faster interpreter for the day
+DEFAULT_INTERPRETER = 'python'
+# `aoc watch` waits for this many seconds without a save before rerunning
+DEFAULT_DEBOUNCE_SECONDS = 0.2
+_session = None
+
+def get_session():
+    """The shared requests.Session, created on first use."""
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+        _session.headers.update({'User-Agent': 'kevinwang wang-aoc-cli https://github.com/VitamintK/wang-aoc-cli'})
+    return _session
 
 # Get and set state in the config file ####
+_config_data = None
+
 def get_config_path():
     config_dir = os.environ.get('XDG_CONFIG_HOME', os.path.join(os.path.expanduser('~'), '.config'))
     config_path = os.path.join(config_dir, 'aoc_cli', 'config.json')
     return config_path
 
-def get_config_data():
+@contextlib.contextmanager
+def config_lock():
+    """Exclusive lock on the config file, so that concurrent `aoc` invocations don't clobber each other's changes."""
     CONFIG_PATH = get_config_path()
     os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
+    with open(CONFIG_PATH + '.lock', 'w') as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            # no flock on windows. the atomic write still means the file is never half-written.
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def read_config_file():
+    CONFIG_PATH = get_config_path()
     if os.path.exists(CONFIG_PATH):
         with open(CONFIG_PATH, 'r') as f:
-            data = json.load(f)
-    else:
-        data = {}
-    return data
+            return json.load(f)
+    return {}
 
-def write_config_data(data):
-    CONFIG_PATH = get_config_path()
-    os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
-    with open(CONFIG_PATH, 'w') as f:
-        json.dump(data, f)
+def get_config_data():
+    """The config, read from disk once per process."""
+    global _config_data
+    if _config_data is None:
+        _config_data = read_config_file()
+    return _config_data
+
+def update_config_data(**changes):
+    """Set some config keys. Re-reads the file under the lock so that changes made by other processes aren't lost."""
+    global _config_data
+    with config_lock():
+        data = read_config_file()
+        data.update(changes)
+        cache.write_atomic(get_config_path(), json.dumps(data).encode())
+    _config_data = data
 
 def get_day_from_config():
     return get_config_data()['day']
@@ -42,6 +93,27 @@ def get_year_from_config_with_default():
     else:
         return 2023
     
+def get_interpreters():
+    """The interpreters `aoc race` tries: the `interpreters` config key (set with `aoc interpreters`),
+    or by default whichever of python, this python and pypy3 are installed."""
+    import sys
+    interpreters = get_config_data().get('interpreters')
+    if interpreters is None:
+        interpreters = []
+        for interpreter in [DEFAULT_INTERPRETER, sys.executable, 'pypy3']:
+            if shutil.which(interpreter) is not None and interpreter not in interpreters:
+                interpreters.append(interpreter)
+    return interpreters
+
+def get_interpreter(year, day):
+    """The interpreter `aoc race` picked for the day, or None to use DEFAULT_INTERPRETER."""
+    return get_config_data().get('interpreter_winners', {}).get(f'{year}/{day}')
+
+def interpreter_command(interpreter):
+    """The argv prefix for running with interpreter (None for DEFAULT_INTERPRETER)."""
+    import shlex
+    return [os.path.expanduser(part) for part in shlex.split(interpreter or DEFAULT_INTERPRETER)]
+
 def get_token_from_config():
     data = get_config_data()
     if 'session_token' not in data:
@@ -55,17 +127,45 @@ def get_openai_key_from_config():
     return data['openai_key']
 
 # Get and save inputs from adventofcode.com ###
-def get_real_input(year, day, token):
-    url = f'{BASE_URL}/{year}/day/{day}/input'
+def get_cached(year, day, resource, url, token, immutable, refresh=False):
+    """GET url, going through the local cache (see aoc_cli/cache.py).
+    Immutable resources (inputs) are never re-fetched once cached. Mutable ones (descriptions) are served
+    from the cache unless refresh is set or the entry was invalidated, in which case we send a conditional GET."""
+    owner = cache.owner_of(token)
+    entry = cache.get_entry(owner, year, day, resource)
+    if entry is not None and (immutable or not (refresh or entry['stale'])):
+        return cache.read_body(entry)
     headers = {"Cookie": f"session={token}"}
-    response = session.get(url, headers=headers, allow_redirects=False)
+    if entry is not None:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+    response = get_session().get(url, headers=headers, allow_redirects=False)
     response.raise_for_status()
+    if response.status_code == 304 and entry is not None:
+        cache.revalidated(owner, year, day, resource)
+        return cache.read_body(entry)
     if 300 <= response.status_code < 400:
         # expired tokens 302 redirect to the overall leaderboard
         msg = f"the auth token ...{token[-4:]} is dead"
         raise ValueError(msg)
+    if response.status_code != 200:
+        print(f"got {response.status_code} status code")
+        raise ValueError(f"HTTP {response.status_code} at {url}")
+    cache.put(owner, year, day, resource, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
     return response.text
 
+def get_real_input(year, day, token):
+    url = f'{BASE_URL}/{year}/day/{day}/input'
+    return get_cached(year, day, 'input', url, token, immutable=True)
+
+def get_description_page(year, day, token, refresh=False):
+    # part 2 only shows up on the page after part 1 is solved, so the description isn't immutable.
+    # submit_aux invalidates it when part 1 is solved; use refresh if you solved it somewhere else.
+    url = f'{BASE_URL}/{year}/day/{day}'
+    return get_cached(year, day, 'description', url, token, immutable=False, refresh=refresh)
+
 # common helper functions
 def get_year_and_day_with_fallbacks(args):
     """For each of [year, date], use it if it's in args, otherwise check config, otherwise use a default."""
@@ -83,6 +183,7 @@ def get_year_with_fallbacks(args):
     return year
 
 def parse_html_and_get_articles(html):
+    from bs4 import BeautifulSoup
     bs = BeautifulSoup(html, 'html.parser')
     articles = bs.find_all('article')
     assert len(articles) in [1, 2]
@@ -92,33 +193,169 @@ def parse_html_and_get_articles(html):
     #       maybe by just returning articles and letting the caller decode?
     return [article.decode_contents(formatter=None) for article in articles]
 
-def run_python_with_input(py_path, input_path):
-    output = []
-    def execute(cmd, inp):
-        popen = subprocess.Popen(cmd, stdin=inp, stdout=subprocess.PIPE, universal_newlines=True)
-        for stdout_line in iter(popen.stdout.readline, ""):
-            yield stdout_line 
-        popen.stdout.close()
-        # return_code = popen.wait()
-        # if return_code:
-        #     raise subprocess.CalledProcessError(return_code, cmd)
-    with open(input_path, 'r') as input_file:
-        for l in execute(['python', '-u', py_path], input_file):
-            print(l, end="")
-            output.append(l)
-    return output
+print_lock = threading.Lock()
+
+def start_python(py_path, input_file, run_limits=None, warm=True, interpreter=None, env=None):
+    """Start py_path in its own directory, with interpreter (a command line like `pypy3` or `~/venvs/np/bin/python`).
+    With the default interpreter and warm, use the forkserver (`aoc forkserver`) when one is running in this directory.
+    env has extra environment variables for it."""
+    import subprocess
+    from aoc_cli import forkserver, limits
+    if warm and interpreter is None:
+        warm_sock = forkserver.connect()
+        if warm_sock is not None:
+            return forkserver.WarmPopen(warm_sock, py_path, input_file, run_limits, env)
+    cmd = interpreter_command(interpreter) + ['-u', os.path.abspath(py_path)]
+    # the runner has threads, which makes preexec_fn unsafe, so the rlimits are set from outside the child instead
+    set_rlimits_after = bool(run_limits) and limits.can_limit_other_processes()
+    if run_limits and not set_rlimits_after:
+        cmd = limits.limited_command(cmd, run_limits)
+    popen = limits.Popen(cmd, stdin=input_file, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                         cwd=os.path.dirname(os.path.abspath(py_path)), env={**os.environ, **(env or {})})
+    if set_rlimits_after:
+        limits.apply_rlimits(run_limits, popen.pid)
+    return popen
+
+def wait_with_rusage(popen):
+    """Wait for the process to exit, and return its (returncode, utime, stime, maxrss) from the OS's accounting."""
+    if hasattr(popen, 'startup_saved'):
+        # it came from the forkserver, which reaps it for us
+        popen.wait()
+        return popen.returncode, popen.rusage['utime'], popen.rusage['stime'], popen.rusage['maxrss']
+    _, status, rusage = os.wait4(popen.pid, 0)
+    popen.returncode = os.waitstatus_to_exitcode(status)
+    return popen.returncode, rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss
+
+def run_python_with_input(py_path, input_path, label=None, on_start=None, echo_limit=None, spool_path=None, run_limits=None, quiet=False, warm=True, interpreter=None):
+    """Runs py_path with input_path as stdin, echoing its output.
+    Returns (the last lines of its stdout, {"returncode": ..., "limit": the limit that stopped it, or None,
+    "stats": its resource usage, "stderr": the last lines of its stderr, "memo": its aoc_cli.memo hits and misses, or None}).
+    Afterwards, prints how long it took and how much memory it used, and records that in the day's history.
+    If label is given, each echoed line is prefixed with it so that concurrent runs can be told apart.
+    on_start is called with the process handle once it's started, e.g. so that the caller can kill it.
+    Echoing stops after echo_limit bytes; if spool_path is given, the full stdout is written there.
+    run_limits are the resource limits to enforce (see aoc_cli/limits.py).
+    With quiet=True nothing is printed, and it's up to the caller to report the result.
+    With warm=False the timing is comparable between runs: the forkserver isn't used, and aoc_cli.memo is bypassed.
+    interpreter is what to run it with, or None for DEFAULT_INTERPRETER (see get_interpreter)."""
+    import tempfile
+    from aoc_cli import capture, limits, memo, telemetry
+    run_limits = run_limits or {}
+    prefix = f'[{label}] ' if label is not None else ''
+    # tell aoc_cli.memo in the solution which input it's on, and where to report its hits and misses
+    fd, memo_stats_path = tempfile.mkstemp(prefix='aoc-memo-', suffix='.json')
+    os.close(fd)
+    try:
+        env = {memo.INPUT_HASH_ENV: telemetry.hash_file(input_path), memo.STATS_ENV: memo_stats_path}
+        if not warm:
+            env[memo.DISABLE_ENV] = '1'
+        start = time.perf_counter()
+        with open(input_path, 'r') as input_file:
+            popen = start_python(py_path, input_file, run_limits, warm, interpreter, env)
+            watchdog = limits.Watchdog(popen, run_limits)
+            output_capture = capture.Capture(prefix, echo_limit, spool_path, print_lock, on_output=watchdog.check_output, echo=not quiet)
+            if on_start is not None:
+                on_start(popen)
+            output_capture.read_all(popen)
+            popen.stdout.close()
+            popen.stderr.close()
+        return_code, utime, stime, maxrss = wait_with_rusage(popen)
+        wall = time.perf_counter() - start
+        try:
+            with open(memo_stats_path, 'r') as f:
+                memo_stats = json.load(f)
+        except ValueError:
+            # the solution didn't use aoc_cli.memo
+            memo_stats = None
+    finally:
+        os.unlink(memo_stats_path)
+    stderr = output_capture.tail_lines('stderr')
+    limit = watchdog.done(return_code, utime, stime, ''.join(stderr))
+    stats = telemetry.make_stats(wall, utime, stime, maxrss)
+    output = output_capture.tail_lines()
+    answer = output[-1].strip() if output else None
+    memo_hits = memo_stats['hits'] if memo_stats is not None else 0
+    comparison = telemetry.record_run(py_path, input_path, stats, answer, return_code, interpreter, hasattr(popen, 'startup_saved'), memo_hits)
+    result = {'returncode': return_code, 'limit': limit, 'stats': stats, 'stderr': stderr, 'memo': memo_stats}
+    if quiet:
+        return output, result
+    with print_lock:
+        print(f"{prefix}({telemetry.format_stats(stats)})")
+        if interpreter is not None:
+            print(f"{prefix}(ran with {interpreter}, the winner of `aoc race`)")
+        if comparison:
+            print(f"{prefix}({comparison})")
+        if memo_stats is not None:
+            unkeyable = f", {memo_stats['unkeyable']} call(s) with arguments that can't be keyed" if memo_stats.get('unkeyable') else ''
+            print(f"{prefix}(memo: {memo_stats['hits']} hit(s), {memo_stats['misses']} miss(es){unkeyable}, saved ~{memo_stats['saved']:.2f}s)")
+        if hasattr(popen, 'startup_saved'):
+            print(f"{prefix}(forkserver saved ~{popen.startup_saved:.2f}s of interpreter startup)")
+        if limit is not None:
+            print(f"{prefix}stopped: hit the {limits.describe(run_limits, limit)}")
+        if return_code < 0:
+            print(f"{prefix}killed by {signal.Signals(-return_code).name}")
+        elif return_code > 0:
+            print(f"{prefix}exited with status {return_code}")
+        if limit is not None and output and not output_capture.truncated():
+            # (if the echo was cut off, the capture already showed the last lines)
+            print(f"{prefix}last lines of output:")
+            for line in output[-5:]:
+                print(prefix + line.rstrip('\n'))
+    return output, result
+
+def get_limits(args):
+    """Resource limits for solution runs, from the command line or the config (see aoc_cli/limits.py)."""
+    from aoc_cli import limits
+    config = get_config_data()
+    run_limits = {}
+    for name in limits.LIMITS:
+        value = getattr(args, name)
+        if value is None:
+            value = config.get(name)
+        if value is not None:
+            run_limits[name] = value
+    return run_limits
+
+def get_capture_options(args, input_path):
+    """echo_limit and spool_path for run_python_with_input, from the command line or the config."""
+    echo_limit = args.echo_limit
+    if echo_limit is None:
+        echo_limit = get_config_data().get('echo_limit', DEFAULT_ECHO_LIMIT)
+    spool_path = f'{input_path[:-len(".in")]}.stdout' if args.spool else None
+    return {'echo_limit': echo_limit if echo_limit > 0 else None, 'spool_path': spool_path}
+
+def find_examples(day):
+    """All (input path, answer path) pairs for the day's examples: day{day}_example.in, day{day}_example2.in, ...
+    Examples with empty inputs are skipped."""
+    examples = []
+    for in_path in sorted(glob.glob(f'day{day}_example*.in'), key=lambda path: (len(path), path)):
+        with open(in_path, 'r') as f:
+            if f.read().strip() == '':
+                continue
+        examples.append((in_path, in_path[:-len('.in')] + '.answer'))
+    return examples
 
 def submit_aux(year, day, level, answer):
     url = f'{BASE_URL}/{year}/day/{day}/answer'
     token = get_token_from_config()
+    owner = cache.owner_of(token)
+    # don't spend a submission (and a cooldown) on an answer we already know is wrong
+    reason = ledger.check(owner, year, day, level, answer)
+    if reason is not None:
+        return f'Not submitting: {reason}.'
+    ledger.wait_for_cooldown(owner, year, day, level)
     fields = {"level": level, "answer": answer}
     headers = {"Cookie": f"session={token}"}
-    response = session.post(url, headers=headers, data=fields, allow_redirects=False)
+    response = get_session().post(url, headers=headers, data=fields, allow_redirects=False)
     response.raise_for_status()
     if response.status_code != 200:
         print(f"got {response.status_code} status code")
         raise ValueError(f"HTTP {response.status_code} at {url}")
     articles = parse_html_and_get_articles(response.text)
+    result = ledger.record(owner, year, day, level, answer, articles[0])
+    if result in [ledger.RIGHT, ledger.ALREADY_SOLVED]:
+        # this level is solved, so the description page now has more on it
+        cache.invalidate(owner, year, day, 'description')
     return articles[0]
 
 ###### commands ##############################################
@@ -132,21 +369,12 @@ def cd(args):
     print(f"cd ~/AlgorithmProblems/miscellaneous/advent-of-code/{year}")
 
 def set_day(args):
-    day = args.day
-    data = get_config_data()
-    data['day'] = day
-    write_config_data(data)
+    update_config_data(day=args.day)
 
 def set_year(args):
-    year = args.year
-    data = get_config_data()
-    data['year'] = year
-    write_config_data(data)
+    update_config_data(year=args.year)
 
-def make(args):
-    day = args.day
-    if day is None:
-        day = get_day_from_config()
+def make_solution_file(day):
     # copy the file 'boilerplate.py' to the file 'day{x}.py'
     py_path = f'day{day}.py'
     if os.path.exists(py_path):
@@ -155,6 +383,13 @@ def make(args):
         with open('boilerplate.py', 'r') as f:
             with open(py_path, 'w') as f2:
                 shutil.copyfileobj(f, f2)
+    return py_path
+
+def make(args):
+    day = args.day
+    if day is None:
+        day = get_day_from_config()
+    py_path = make_solution_file(day)
 
     example_in_filepath = f'day{day}_example.in'
     real_in_filepath = f'day{day}_real.in'
@@ -165,36 +400,91 @@ def make(args):
             with open(filepath, 'w') as f:
                 pass
 
+def estimate_server_clock_offset(samples=5):
+    """Estimate (server clock - local clock) in seconds from the Date headers of a few HEAD requests.
+    Date only has 1s resolution, but each response tells us the server's clock was in [Date, Date+1)
+    at some point while the request was in flight. Spacing the samples out by a fraction of a second
+    and intersecting those intervals narrows it down. Returns (offset, uncertainty)."""
+    from email.utils import parsedate_to_datetime
+
+    lo, hi = float('-inf'), float('inf')
+    for i in range(samples):
+        if i > 0:
+            time.sleep(0.23)
+        sent = time.time()
+        response = get_session().head(BASE_URL, allow_redirects=False)
+        received = time.time()
+        server = parsedate_to_datetime(response.headers['Date']).timestamp()
+        lo = max(lo, server - received)
+        hi = min(hi, server + 1 - sent)
+    if lo > hi:
+        # the intervals don't overlap, which means the network is being weird. just split the difference
+        lo, hi = hi, lo
+    return (lo + hi) / 2, (hi - lo) / 2
+
+def retry_until_released(fetch, max_delay=1):
+    """Call fetch until it stops 404ing (AoC 404s until the puzzle unlocks), backing off from 50ms to max_delay."""
+    import requests
+
+    delay = 0.05
+    while True:
+        try:
+            return fetch()
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
 def start_daemon(args):
-    """This is actually not a daemon for now. Maybe it's better this way anyways. It just blocks synchronously until midnight."""
+    """This is actually not a daemon for now. Maybe it's better this way anyways. It just blocks synchronously until the puzzle is released."""
     year, day = get_year_and_day_with_fallbacks(args)
+    token = get_token_from_config()
+    from aoc_cli import sync as bulk
+    release = bulk.release_time(year, day)
+
+    def log(msg):
+        # times are relative to the actual release, on the server's clock
+        print(f'[{time.time() + offset - release:+.3f}s] {msg}')
 
-    import time
-    import datetime
-    from threading import Thread
-
-    EST = datetime.timezone(datetime.timedelta(hours=-5))
-    def wait_until_midnight():
-        now = datetime.datetime.now(EST)
-        tomorrow = now + datetime.timedelta(days=1)
-        midnight = datetime.datetime(year=tomorrow.year, month=tomorrow.month, day=tomorrow.day, hour=0, minute=0, second=3, tzinfo=EST)
-        wait_seconds = (midnight - now).total_seconds()
-        while wait_seconds > 0:
-            wait_seconds = (midnight - datetime.datetime.now(EST)).total_seconds()
-            hours, remainder = divmod(wait_seconds, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            print(f"waiting {int(hours)}h{int(minutes)}m{int(seconds)}s until midnight", end='\r')
-            time.sleep(1)
-        wait_seconds = max(0, wait_seconds)
-        time.sleep(wait_seconds)
-
-    def run_tasks():
-        get_real_and_description_and_parse_example(args)
-
-    wait_until_midnight()
-    print('time to go! getting everything now...')
-    run_tasks()
+    offset, uncertainty = estimate_server_clock_offset()
+    print(f'server clock is {offset:+.3f}s (±{uncertainty:.3f}s) relative to the local clock')
+    def seconds_left():
+        return release - (time.time() + offset)
 
+    # sleep in 1s steps until shortly before release
+    PRECONNECT_SECONDS = 5
+    while True:
+        # read the clock once per step: it moves between calls, and could pass the threshold in between
+        left = seconds_left()
+        if left <= PRECONNECT_SECONDS:
+            break
+        hours, remainder = divmod(left, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        print(f"waiting {int(hours)}h{int(minutes)}m{int(seconds)}s until the puzzle is released", end='\r')
+        time.sleep(max(0, min(1, left - PRECONNECT_SECONDS)))
+        if PRECONNECT_SECONDS + 60 < seconds_left() < PRECONNECT_SECONDS + 61:
+            # re-measure a minute out, in case the local clock drifted since we started
+            offset, uncertainty = estimate_server_clock_offset()
+    if seconds_left() > 0:
+        print()
+        # open the TLS connection now so that the session's pool has a live connection at release time
+        get_session().head(BASE_URL, allow_redirects=False)
+        log('connected')
+        # openai is slow to import (parse_example.go only imports it when called), so get that out of the way too
+        import openai
+        from aoc_cli.parse_example import parse_example
+        log('imported parser')
+        time.sleep(max(0, seconds_left()))
+
+    log('time to go! getting everything now...')
+    import asyncio
+    asyncio.run(fetch_and_parse_example(year, day, token, log, wait_for_release=True))
+
+def start_forkserver(args):
+    """Blocks, serving warm runs for `aoc run` and `aoc test` in this directory until Ctrl-C."""
+    from aoc_cli import forkserver
+    forkserver.serve()
 
 def test(args):
     year, day = get_year_and_day_with_fallbacks(args)
@@ -202,8 +492,15 @@ def test(args):
     if not os.path.exists(py_path):
         raise ValueError(f'file {py_path} does not exist. create it with `aoc make {day}`')
     example_in_filepath = f'day{day}_example.in'
-    output = run_python_with_input(py_path, example_in_filepath)
-    print(output, end='')
+    run_limits = get_limits(args)
+    output, result = run_python_with_input(py_path, example_in_filepath, run_limits=run_limits, interpreter=get_interpreter(year, day),
+                                           **get_capture_options(args, example_in_filepath))
+    failure = describe_failure(result, run_limits)
+    if failure is not None:
+        print(f'No answer: the run {failure}.')
+    elif output:
+        # only the tail of the output is kept, so just show the answer line rather than dumping all of it again
+        print(f'Answer: {output[-1].strip()}')
     
 def submit(args):
     # used aocd/models.py:Puzzle._submit for inspiration
@@ -232,30 +529,71 @@ def run(args):
     py_path = f'day{day}.py'
     if not os.path.exists(py_path):
         raise ValueError(f'file {py_path} does not exist. create it with `aoc make {day}`')
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     real_in_filepath = f'day{day}_real.in'
-    example_in_filepath = f'day{day}_example.in'
-    example_answer_filepath = f'day{day}_example.answer'
+    examples = find_examples(day)
+    # the example(s) and the real input are independent, so run them all at once.
+    # each run is its own python process; the threads just stream their output.
+    cancelled = threading.Event()
+    real = {}
+    def on_real_start(popen):
+        real['popen'] = popen
+        if cancelled.is_set():
+            popen.kill()
+    run_limits = get_limits(args)
+    interpreter = get_interpreter(year, day)
+    print(f'Running on {len(examples)} example(s) and the real input in parallel:')
     correct = False
-    if os.path.exists(example_in_filepath):
-        with open(example_in_filepath, 'r') as f:
-            example_in = f.read()
-        if example_in.strip() != '':
-            print('Running on example:')
-            output = run_python_with_input(py_path, example_in_filepath)
-            example_ans = output[-1].strip()
-            if os.path.exists(example_answer_filepath):
-                with open(example_answer_filepath, 'r') as f:
-                    expected_ans = f.read().strip()
+    with ThreadPoolExecutor(max_workers=len(examples) + 1) as pool:
+        real_future = pool.submit(run_python_with_input, py_path, real_in_filepath, 'real', on_real_start, run_limits=run_limits, interpreter=interpreter, **get_capture_options(args, real_in_filepath))
+        example_futures = {}
+        for in_path, answer_path in examples:
+            label = in_path[len(f'day{day}_'):-len('.in')]
+            example_futures[pool.submit(run_python_with_input, py_path, in_path, label, run_limits=run_limits, interpreter=interpreter, **get_capture_options(args, in_path))] = (label, answer_path)
+        results = []
+        for future in as_completed(example_futures):
+            label, answer_path = example_futures[future]
+            output, _ = future.result()
+            example_ans = output[-1].strip() if output else ''
+            if not os.path.exists(answer_path):
+                continue
+            with open(answer_path, 'r') as f:
+                expected_ans = f.read().strip()
+            results.append(example_ans == expected_ans)
+            with print_lock:
                 if example_ans == expected_ans:
-                    print(f'Answer is correct: {example_ans}')
-                    correct = True
+                    print(f'[{label}] Answer is correct: {example_ans}')
                 else:
-                    print(f'Answer is incorrect: {example_ans}. Expected: {expected_ans}')
-            print()
-    print('Running on real input:')
-    output = run_python_with_input(py_path, real_in_filepath)
-    real_ans = output[-1].strip()
+                    print(f'[{label}] Answer is incorrect: {example_ans}. Expected: {expected_ans}')
+            if example_ans != expected_ans and args.on_mismatch == 'cancel':
+                cancelled.set()
+                if 'popen' in real:
+                    real['popen'].kill()
+        correct = len(results) > 0 and all(results)
+        output, real_result = real_future.result()
     print()
+    if cancelled.is_set() and real_result['returncode'] < 0:
+        print("The example answer was incorrect, so the real run was cancelled.")
+        return
+    # (if the real run had already finished when an example failed, its answer is still shown, but correct is False so the prompt defaults to no)
+    failure = describe_failure(real_result, run_limits)
+    if failure is not None:
+        print(f"The real run failed ({failure}), so there's no answer to submit.")
+        return
+    if not output:
+        print("The real run didn't print anything, so there's no answer to submit.")
+        return
+    real_ans = output[-1].strip()
+    try:
+        token = get_token_from_config()
+    except ValueError:
+        # no token yet: submitting will ask for one, but there's no ledger to check
+        token = None
+    reason = ledger.check(cache.owner_of(token), year, day, level, real_ans) if token is not None else None
+    if reason is not None:
+        print(f"The answer for the real input is: {real_ans}")
+        print(f"Not submitting: {reason}.")
+        return
     if correct:
         print("The answer for the example input answer was correct.")
         print(f"The answer for the real input is: {real_ans}")
@@ -270,19 +608,283 @@ def run(args):
     else:
         print("Not submitting.")
 
+def profile(args):
+    """Run the solution under aoc_cli/profiler.py: print the hot functions and lines, and write collapsed stacks for flamegraphs."""
+    import subprocess
+    year, day = get_year_and_day_with_fallbacks(args)
+    py_path = f'day{day}.py'
+    if not os.path.exists(py_path):
+        raise ValueError(f'file {py_path} does not exist. create it with `aoc make {day}`')
+    input_path = f'day{day}_{args.input}.in'
+    collapsed_path = f'day{day}_{args.input}.collapsed'
+    profiler_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiler.py')
+    cmd = interpreter_command(get_interpreter(year, day)) + ['-u', profiler_path, '--mode', args.mode, '--top', str(args.top), '--collapsed', collapsed_path]
+    if args.time_limit is not None:
+        cmd += ['--time-limit', str(args.time_limit)]
+    with open(input_path, 'r') as input_file:
+        subprocess.run(cmd + [py_path], stdin=input_file)
+    print(f'render it with e.g. `flamegraph.pl {collapsed_path} > day{day}.svg`, or open it in https://www.speedscope.app')
+
+def describe_failure(result, run_limits):
+    """Why a run produced no usable answer, in a few words, or None if it didn't fail."""
+    from aoc_cli import limits
+    if result['limit'] is not None:
+        return f"hit the {limits.describe(run_limits, result['limit'])}"
+    if result['returncode'] < 0:
+        return f"was killed by {signal.Signals(-result['returncode']).name}"
+    if result['returncode'] > 0:
+        error = result['stderr'][-1].strip() if result['stderr'] else ''
+        return f"exited with status {result['returncode']}" + (f': {error}' if error else '')
+    return None
+
+def watch_round(py_path, day, run_limits, interpreter, cancelled, running, show):
+    """One round of `aoc watch`: run the example(s), then the real input if none of them is wrong.
+    running holds the live process, so that a newer save can kill it; once cancelled is set, nothing more is shown."""
+    def on_start(popen):
+        running.append(popen)
+        if cancelled.is_set():
+            popen.kill()
+    def run_one(in_path):
+        try:
+            return run_python_with_input(py_path, in_path, on_start=on_start, run_limits=run_limits, quiet=True, interpreter=interpreter)
+        finally:
+            running.clear()
+    parts = []
+    for in_path, answer_path in find_examples(day):
+        label = in_path[len(f'day{day}_'):-len('.in')]
+        show(parts + [f'{label} running...'], final=False)
+        output, result = run_one(in_path)
+        if cancelled.is_set():
+            return
+        failure = describe_failure(result, run_limits)
+        if failure is not None:
+            show(parts + [f'{label} ✗ {failure}'])
+            return
+        answer = output[-1].strip() if output else ''
+        expected = None
+        if os.path.exists(answer_path):
+            with open(answer_path, 'r') as f:
+                expected = f.read().strip()
+        if expected is not None and answer != expected:
+            show(parts + [f'{label} ✗ {answer} (expected {expected})'])
+            return
+        parts.append(f"{label} {'✓' if expected is not None else '?'} {answer} ({result['stats']['wall']:.2f}s)")
+    real_in_filepath = f'day{day}_real.in'
+    if not os.path.exists(real_in_filepath) or os.path.getsize(real_in_filepath) == 0:
+        show(parts + ['no real input yet'])
+        return
+    show(parts + ['real running...'], final=False)
+    output, result = run_one(real_in_filepath)
+    if cancelled.is_set():
+        return
+    failure = describe_failure(result, run_limits)
+    if failure is not None:
+        show(parts + [f'real ✗ {failure}'])
+        return
+    stats = result['stats']
+    answer = output[-1].strip() if output else '(no output)'
+    show(parts + [f"real: {answer} ({stats['wall']:.2f}s wall, {stats['utime'] + stats['stime']:.2f}s CPU, {stats['maxrss'] / 2**20:.0f}MB)"])
+
+def watch(args):
+    """Rerun the solution whenever dayN.py, its example(s) or its real input is saved, keeping the result on one status line.
+    A save during a run cancels it and starts over."""
+    import sys
+    from aoc_cli import watch as file_watch
+    year, day = get_year_and_day_with_fallbacks(args)
+    py_path = f'day{day}.py'
+    if not os.path.exists(py_path):
+        raise ValueError(f'file {py_path} does not exist. create it with `aoc make {day}`')
+    run_limits = get_limits(args)
+    names = {py_path, f'day{day}_real.in', f'day{day}_example.in', f'day{day}_example.answer'}
+    for in_path, answer_path in find_examples(day):
+        names |= {in_path, answer_path}
+    tty = sys.stdout.isatty()
+    def show(parts, final=True):
+        line = f"[{datetime.datetime.now():%H:%M:%S}] " + ' | '.join(parts)
+        with print_lock:
+            if tty:
+                # redraw the status line in place
+                width = shutil.get_terminal_size().columns
+                print('\r\033[K' + line[:width - 1], end='', flush=True)
+            elif final:
+                print(line, flush=True)
+    watcher = file_watch.make_watcher('.', names)
+    if tty:
+        print(f'watching {py_path} and its inputs ({type(watcher).__name__}). Ctrl-C to stop.')
+    current = None
+    def cancel():
+        thread, cancelled, running = current
+        cancelled.set()
+        for popen in list(running):
+            popen.kill()
+        thread.join()
+    try:
+        while True:
+            cancelled = threading.Event()
+            running = []
+            thread = threading.Thread(target=watch_round, args=(py_path, day, run_limits, get_interpreter(year, day), cancelled, running, show), daemon=True)
+            current = (thread, cancelled, running)
+            thread.start()
+            file_watch.wait_debounced(watcher, args.debounce)
+            cancel()
+    except KeyboardInterrupt:
+        if current is not None:
+            cancel()
+        print()
+    finally:
+        watcher.close()
+
+def bench(args):
+    """Rerun every day with a real input, check the answers against the accepted ones, and compare the timings with the previous bench."""
+    import sys
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from aoc_cli import bench as benchmarks
+    root = '.'
+    days = []
+    for year, directory in benchmarks.find_year_dirs(root, args.years):
+        if year is None:
+            year = get_year_from_config_with_default()
+        days += [(year, day, directory) for day in benchmarks.find_days(directory)]
+    if not days:
+        raise ValueError('no days to bench: expected dayN.py and dayN_real.in files, here or in year directories')
+    try:
+        owner = cache.owner_of(get_token_from_config())
+    except ValueError:
+        owner = None
+    run_limits = get_limits(args)
+    threshold = args.threshold if args.threshold is not None else benchmarks.DEFAULT_THRESHOLD
+    # every run is its own python process, so one thread per core keeps one solution running per core
+    jobs = args.jobs or os.cpu_count() or 1
+    if not args.json:
+        print(f'benching {len(days)} day(s), {jobs} at a time...', file=sys.stderr)
+    def bench_day(year, day, directory):
+        py_path = os.path.join(directory, f'day{day}.py')
+        output, result = run_python_with_input(py_path, os.path.join(directory, f'day{day}_real.in'), run_limits=run_limits, quiet=True, warm=False,
+                                               interpreter=get_interpreter(year, day))
+        failure = describe_failure(result, run_limits)
+        # a failed run's last line isn't its answer
+        answer = output[-1].strip() if output and failure is None else None
+        # the ledger's answers win over the ones in dayN.answer
+        correct = {**benchmarks.known_answers(directory, day), **(ledger.correct_answers(owner, year, day) if owner is not None else {})}
+        return {
+            'year': year,
+            'day': day,
+            'answer': answer,
+            'check': benchmarks.check_answer(answer, correct) if failure is None else 'failed',
+            'failure': failure,
+            'returncode': result['returncode'],
+            **result['stats'],
+        }
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(bench_day, year, day, directory) for year, day, directory in days]
+        for future in as_completed(futures):
+            results.append(future.result())
+    results.sort(key=lambda result: (result['year'], result['day']))
+    benchmarks.mark_regressions(results, benchmarks.previous_bench(root), threshold)
+    benchmarks.append_history(root, results)
+    if args.json:
+        print(json.dumps(results, indent=1))
+    else:
+        print(benchmarks.format_table(results))
+    failed = [result for result in results if result['failure'] is not None or result['check'] == 'wrong']
+    regressed = [result for result in results if result['regressed']]
+    if not args.json:
+        print()
+        print(f"{len(results)} day(s): {len(failed)} failed or wrong, {len(regressed)} more than {threshold * 100:.0f}% slower than the previous bench")
+    if failed or regressed:
+        sys.exit(1)
+
+def race(args):
+    """Run the solution with each of get_interpreters(), check that they agree, and make the fastest one the day's interpreter."""
+    year, day = get_year_and_day_with_fallbacks(args)
+    winners = dict(get_config_data().get('interpreter_winners', {}))
+    if args.forget:
+        winners.pop(f'{year}/{day}', None)
+        update_config_data(interpreter_winners=winners)
+        print(f'day {day} will run with {DEFAULT_INTERPRETER} again')
+        return
+    py_path = f'day{day}.py'
+    if not os.path.exists(py_path):
+        raise ValueError(f'file {py_path} does not exist. create it with `aoc make {day}`')
+    input_path = f'day{day}_{args.input}.in'
+    if not os.path.exists(input_path):
+        raise ValueError(f'file {input_path} does not exist')
+    run_limits = get_limits(args)
+    interpreters = get_interpreters()
+    width = max(len(interpreter) for interpreter in interpreters)
+    # one at a time, so that they don't compete for the CPU
+    print(f'running {py_path} < {input_path} with {len(interpreters)} interpreter(s), best of {args.repeat}:')
+    answers = {}
+    walls = {}
+    for interpreter in interpreters:
+        best = None
+        failure = None
+        for _ in range(args.repeat):
+            try:
+                output, result = run_python_with_input(py_path, input_path, run_limits=run_limits, quiet=True, warm=False,
+                                                       interpreter=None if interpreter == DEFAULT_INTERPRETER else interpreter)
+            except FileNotFoundError:
+                failure = 'not found'
+                break
+            failure = describe_failure(result, run_limits)
+            if failure is not None:
+                break
+            if best is None or result['stats']['wall'] < best[1]['wall']:
+                best = (output[-1].strip() if output else '', result['stats'])
+        if failure is not None:
+            print(f'  {interpreter.ljust(width)}  {failure}')
+            continue
+        answer, stats = best
+        answers[interpreter] = answer
+        walls[interpreter] = stats['wall']
+        print(f"  {interpreter.ljust(width)}  {answer:<16} {stats['wall']:.3f}s wall, {stats['utime'] + stats['stime']:.3f}s CPU, {stats['maxrss'] / 2**20:.1f}MB peak memory")
+    print()
+    if not answers:
+        print('no interpreter finished the run')
+        return
+    if len(set(answers.values())) > 1:
+        print("the interpreters don't agree on the answer, so the day's interpreter is unchanged")
+        return
+    winner = min(walls, key=walls.get)
+    runner_up = sorted(walls.values())[1] if len(walls) > 1 else None
+    if runner_up is not None:
+        print(f'{winner} is fastest, {runner_up / walls[winner]:.2f}x faster than the next one')
+    if winner == DEFAULT_INTERPRETER:
+        winners.pop(f'{year}/{day}', None)
+    else:
+        winners[f'{year}/{day}'] = winner
+    update_config_data(interpreter_winners=winners)
+    print(f'day {day} will run with {winner} from now on')
+
+def set_interpreters(args):
+    if args.reset:
+        update_config_data(interpreters=None)
+    elif args.interpreters:
+        update_config_data(interpreters=args.interpreters)
+    for interpreter in get_interpreters():
+        print(interpreter)
+
+def clean_cache(args):
+    """Evict stale and excess entries from the aoc_cli.memo and aoc_cli.input caches. The downloaded puzzles are kept."""
+    from aoc_cli import input as aoc_input, memo
+    max_bytes = memo.MAX_BYTES if args.max_mb is None else int(args.max_mb * 2**20)
+    max_age_days = memo.MAX_AGE_DAYS if args.max_age_days is None else args.max_age_days
+    if args.all:
+        max_bytes, max_age_days = 0, 0
+    for name, directory in [('memo', memo.get_memo_dir()), ('parsed inputs', aoc_input.get_parsed_dir())]:
+        deleted, freed = memo.evict(directory, max_bytes, max_age_days)
+        print(f'{name}: deleted {deleted} file(s), freed {freed / 2**20:.1f}MB')
+
 def set_session_id(args):
     # TODO: add help message and error message telling you to do https://github.com/wimglenn/advent-of-code-wim/issues/1
-    data = get_config_data()
-    data['session_token'] = args.session_token
-    write_config_data(data)
+    update_config_data(session_token=args.session_token)
 
 def set_openai_key(args):
     openai_key = args.openai_key
     if openai_key is None:
         openai_key = input('enter OpenAI key: ')
-    data = get_config_data()
-    data['openai_key'] = openai_key
-    write_config_data(data)
+    update_config_data(openai_key=openai_key)
 
 def get_and_save_input(args):
     year, day = get_year_and_day_with_fallbacks(args)
@@ -294,33 +896,162 @@ def get_and_save_input(args):
 def get_and_save_description(args):
     year, day = get_year_and_day_with_fallbacks(args)
     token = get_token_from_config()
-    url = f'{BASE_URL}/{year}/day/{day}'
-    headers = {"Cookie": f"session={token}"}
-    response = session.get(url, headers=headers, allow_redirects=False)
-    response.raise_for_status()
-    if response.status_code != 200:
-        print(f"got {response.status_code} status code")
-        raise ValueError(f"HTTP {response.status_code} at {url}")
-    articles = parse_html_and_get_articles(response.text)
+    html = get_description_page(year, day, token, refresh=getattr(args, 'refresh', False))
+    articles = parse_html_and_get_articles(html)
     with open(f'day{day}_description.html', 'w') as f:
         f.write(articles[0])
 
+def sync(args):
+    """Download every released input and description for the years, a few at a time and at a polite rate.
+    Files that are already there are skipped, so an interrupted sync can just be rerun."""
+    import requests
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from aoc_cli import sync as bulk
+    years = args.years or [get_year_from_config_with_default()]
+    token = get_token_from_config()
+    owner = cache.owner_of(token)
+    jobs = args.jobs if args.jobs is not None else bulk.DEFAULT_JOBS
+    limiter = bulk.RateLimiter(args.rate if args.rate is not None else bulk.DEFAULT_RATE)
+    counter = bulk.TrafficCounter()
+    session = get_session()
+    # enough pooled connections for every worker, so that they're all reused
+    session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=max(jobs, 10)))
+    session.hooks['response'].append(counter)
+
+    def sync_one(year, day, resource, path):
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            return None
+        entry = cache.get_entry(owner, year, day, resource)
+        if entry is None or (resource == 'description' and entry['stale']):
+            # it's coming from the server rather than the cache
+            limiter.wait()
+        if resource == 'input':
+            text = get_real_input(year, day, token)
+        else:
+            text = parse_html_and_get_articles(get_description_page(year, day, token))[0]
+        cache.write_atomic(path, text.encode())
+        return len(text.encode())
+
+    tasks = []
+    for year in years:
+        directory = '.' if os.path.basename(os.path.abspath('.')) == str(year) else str(year)
+        os.makedirs(directory, exist_ok=True)
+        for day in bulk.released_days(year):
+            tasks.append((year, day, 'input', os.path.join(directory, f'day{day}_real.in')))
+            tasks.append((year, day, 'description', os.path.join(directory, f'day{day}_description.html')))
+    start = time.perf_counter()
+    written, skipped, failed = 0, 0, 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(sync_one, *task): task for task in tasks}
+        for future in as_completed(futures):
+            year, day, resource, path = futures[future]
+            try:
+                size = future.result()
+            except (requests.RequestException, ValueError, AssertionError) as e:
+                failed += 1
+                print(f'{year} day {day}: failed to get the {resource}: {e}')
+                continue
+            if size is None:
+                skipped += 1
+            else:
+                written += 1
+                print(f'{year} day {day}: wrote {path} ({size / 1024:.1f}KB)')
+    elapsed = time.perf_counter() - start
+    print()
+    print(f'{written} file(s) written, {skipped} already there, {failed} failed')
+    print(f'{counter.requests} request(s), {counter.bytes / 1024:.1f}KB downloaded in {elapsed:.1f}s')
+
+async def fetch_and_parse_example(year, day, token, log, wait_for_release=False, use_llm=False):
+    """Fetch the description and the real input in parallel, writing each to disk as soon as it lands,
+    then parse the example out of the (in-memory) description and real input.
+    The example is parsed locally (aoc_cli/parse_example/heuristic.py) unless that isn't confident
+    or use_llm is set, in which case we ask the LLM.
+    If wait_for_release, keep retrying the fetches while the puzzle isn't out yet."""
+    import asyncio
+    from aoc_cli.parse_example import heuristic
+
+    def fetch(get):
+        if wait_for_release:
+            return retry_until_released(get)
+        return get()
+
+    async def real_input_stage():
+        real_input = await asyncio.to_thread(fetch, lambda: get_real_input(year, day, token))
+        log('got real input')
+        with open(f'day{day}_real.in', 'w') as f:
+            f.write(real_input)
+        log(f'wrote day{day}_real.in')
+        return real_input
+
+    async def description_stage():
+        html = await asyncio.to_thread(fetch, lambda: get_description_page(year, day, token))
+        log('got description')
+        description = parse_html_and_get_articles(html)[0]
+        with open(f'day{day}_description.html', 'w') as f:
+            f.write(description)
+        log(f'wrote day{day}_description.html')
+        return description
+
+    def import_parser():
+        # parse_example.go imports openai lazily, so import it here, off the critical path
+        import openai
+        from aoc_cli.parse_example import parse_example
+        return parse_example
+
+    def write_example(parsed_example):
+        print(parsed_example)
+        with open(f'day{day}_example.in', 'w') as f:
+            f.write(parsed_example['Example Input'])
+        with open(f'day{day}_example.answer', 'w') as f:
+            f.write(parsed_example['Example Answer'])
+        log(f'wrote day{day}_example.in and day{day}_example.answer')
+
+    if os.path.exists('boilerplate.py') and not os.path.exists(f'day{day}.py'):
+        make_solution_file(day)
+    real_input_task = asyncio.create_task(real_input_stage())
+    description = await description_stage()
+    # try the cheap local parser first, as soon as the description is here
+    parsed_example, confidence = heuristic.extract(description)
+    log(f'heuristic parse has confidence {confidence:.2f}')
+    if not use_llm and parsed_example is not None and confidence >= HEURISTIC_CONFIDENCE:
+        write_example(parsed_example)
+        await real_input_task
+        return
+    parser_task = asyncio.create_task(asyncio.to_thread(import_parser))
+    real_input = await real_input_task
+    # with the real input, the heuristic can sanity check itself
+    parsed_example, confidence = heuristic.extract(description, real_input)
+    log(f'heuristic parse with the real input has confidence {confidence:.2f}')
+    if not use_llm and parsed_example is not None and confidence >= HEURISTIC_CONFIDENCE:
+        write_example(parsed_example)
+        return
+    openai_key = get_config_data().get('openai_key')
+    if openai_key is None:
+        if parsed_example is None:
+            raise ValueError('Could not find the example. Set your OpenAI key with `aoc openai <openai_key>` to parse it with an LLM.')
+        print('No OpenAI key set (`aoc openai <openai_key>`), so going with the low confidence heuristic parse.')
+        write_example(parsed_example)
+        return
+    parse_example = await parser_task
+    log('parsing example with the LLM')
+    def write_example_input(example_input):
+        # the response is streamed, so the input can be written before the answer comes in
+        with open(f'day{day}_example.in', 'w') as f:
+            f.write(example_input)
+        log(f'wrote day{day}_example.in')
+    parsed_example = json.loads(await asyncio.to_thread(parse_example.go, openai_key, description, real_input, on_example_input=write_example_input))
+    log('parsed example')
+    write_example(parsed_example)
+
 def get_real_and_description_and_parse_example(args):
-    # TODO: make this just parse the example. Then callers should just do the saving themselves first.
-    get_and_save_description(args)
-    get_and_save_input(args)
     year, day = get_year_and_day_with_fallbacks(args)
-    with open(f'day{day}_description.html', 'r') as f:
-        html = f.read()
-    with open(f'day{day}_real.in', 'r') as f:
-        real_input = f.read()
-    from aoc_cli.parse_example import parse_example
-    parsed_example = json.loads(parse_example.go(get_openai_key_from_config(), html, real_input))
-    print(parsed_example)
-    with open(f'day{day}_example.in', 'w') as f:
-        f.write(parsed_example['Example Input'])
-    with open(f'day{day}_example.answer', 'w') as f:
-        f.write(parsed_example['Example Answer'])
+    token = get_token_from_config()
+    start = time.perf_counter()
+    def log(msg):
+        now = datetime.datetime.now()
+        print(f'[{now:%H:%M:%S}.{now.microsecond // 1000:03d} +{time.perf_counter() - start:.3f}s] {msg}')
+    import asyncio
+    asyncio.run(fetch_and_parse_example(year, day, token, log, use_llm=args.llm))
 
 def debug(args):
     data = get_config_data()
@@ -328,6 +1059,17 @@ def debug(args):
 
 ################################################
 
+def add_limit_arguments(parser):
+    parser.add_argument('--timeout', type=float, default=None, help='wall-clock seconds before the run is stopped (config key: timeout)')
+    parser.add_argument('--cpu-limit', type=float, default=None, help='CPU seconds before the run is stopped (config key: cpu_limit)')
+    parser.add_argument('--memory-limit', type=float, default=None, help='address space cap in MB (config key: memory_limit)')
+    parser.add_argument('--output-limit', type=float, default=None, help='MB of output before the run is stopped (config key: output_limit)')
+
+def add_capture_arguments(parser):
+    parser.add_argument('--echo-limit', type=int, default=None,
+                        help=f'stop echoing output to the terminal after this many bytes (default {DEFAULT_ECHO_LIMIT}, 0 for no limit)')
+    parser.add_argument('--spool', action='store_true', help='write the full stdout of each run to dayN_<input>.stdout')
+
 def main():
     # create the top-level parser
     parser = argparse.ArgumentParser()
@@ -370,11 +1112,19 @@ def main():
     parser_get_description = subparsers.add_parser('get-description', help='Get the description of the puzzle for the day')
     parser_get_description.add_argument('year', nargs='?', default=None)
     parser_get_description.add_argument('day', nargs='?', default=None)
+    parser_get_description.add_argument('--refresh', action='store_true', help='revalidate the cached description with the server, e.g. after solving part 1 on the website')
     parser_get_description.set_defaults(func = get_and_save_description)
 
+    parser_sync = subparsers.add_parser('sync', help='Download every released input and description for the years (default: the current year) into year directories.')
+    parser_sync.add_argument('years', nargs='*', type=int)
+    parser_sync.add_argument('--jobs', type=int, default=None, help='how many downloads at once (default 4)')
+    parser_sync.add_argument('--rate', type=float, default=None, help='at most this many requests per second (default 2)')
+    parser_sync.set_defaults(func = sync)
+
     parser_parse_example = subparsers.add_parser('parse-example', help='Parse the example input from the description of the puzzle for the day')
     parser_parse_example.add_argument('year', nargs='?', default=None)
     parser_parse_example.add_argument('day', nargs='?', default=None)
+    parser_parse_example.add_argument('--llm', action='store_true', help='always parse with the LLM instead of trying the local heuristic first')
     parser_parse_example.set_defaults(func = get_real_and_description_and_parse_example)
 
     parser_daemon = subparsers.add_parser('daemon', help="Start a daemon that waits until the day's puzzle is released and gets and parses the inputs when it is.")
@@ -382,10 +1132,15 @@ def main():
     parser_daemon.add_argument('day', nargs='?', default=None)
     parser_daemon.set_defaults(func = start_daemon)
 
+    parser_forkserver = subparsers.add_parser('forkserver', help='Keep a warm python with the boilerplate.py imports loaded, so that `run` and `test` skip interpreter startup.')
+    parser_forkserver.set_defaults(func = start_forkserver)
+
     # run example only
     parser_test = subparsers.add_parser('test', help='test help')
     parser_test.add_argument('year', nargs='?', default=None)
     parser_test.add_argument('day', nargs='?', default=None)
+    add_capture_arguments(parser_test)
+    add_limit_arguments(parser_test)
     parser_test.set_defaults(func = test)
 
     # run both example and input (if available)
@@ -393,8 +1148,52 @@ def main():
     parser_run.add_argument('level', nargs='?', default=None)
     parser_run.add_argument('year', nargs='?', default=None)
     parser_run.add_argument('day', nargs='?', default=None)
+    parser_run.add_argument('--on-mismatch', choices=['continue', 'cancel'], default='continue',
+                            help='what to do with the real run if an example answer is wrong: keep it running and default to not submitting, or cancel it')
+    add_capture_arguments(parser_run)
+    add_limit_arguments(parser_run)
     parser_run.set_defaults(func = run)
 
+    parser_profile = subparsers.add_parser('profile', help='Profile the solution: print the hot functions and lines, and write a collapsed-stack file for flamegraphs.')
+    parser_profile.add_argument('level', nargs='?', default=None, help='ignored; accepted so that the arguments line up with `run`')
+    parser_profile.add_argument('year', nargs='?', default=None)
+    parser_profile.add_argument('day', nargs='?', default=None)
+    parser_profile.add_argument('--input', choices=['real', 'example'], default='real', help='which input to profile on')
+    parser_profile.add_argument('--mode', choices=['sample', 'cprofile'], default='sample',
+                                help='sample: low-overhead stack sampling. cprofile: also run the deterministic profiler, which is exact but slows things down')
+    parser_profile.add_argument('--time-limit', type=float, default=None, help='stop after this many seconds and report the partial profile')
+    parser_profile.add_argument('--top', type=int, default=15, help='how many functions and lines to show')
+    parser_profile.set_defaults(func = profile)
+
+    parser_interpreters = subparsers.add_parser('interpreters', help='Show or set the interpreters `aoc race` tries, e.g. `aoc interpreters python pypy3 ~/venvs/np/bin/python`.')
+    parser_interpreters.add_argument('interpreters', nargs='*', help='the interpreters to try (each may include arguments, e.g. "python3 -O")')
+    parser_interpreters.add_argument('--reset', action='store_true', help='go back to the default: whichever of python, the python aoc runs in and pypy3 are installed')
+    parser_interpreters.set_defaults(func = set_interpreters)
+
+    parser_race = subparsers.add_parser('race', help="Run the day's solution with each interpreter, check they agree, and use the fastest for this day from now on.")
+    parser_race.add_argument('year', nargs='?', default=None)
+    parser_race.add_argument('day', nargs='?', default=None)
+    parser_race.add_argument('--input', choices=['real', 'example'], default='real', help='which input to race on')
+    parser_race.add_argument('--repeat', type=int, default=1, help='run each interpreter this many times and take the fastest')
+    parser_race.add_argument('--forget', action='store_true', help="go back to the default interpreter for the day")
+    add_limit_arguments(parser_race)
+    parser_race.set_defaults(func = race)
+
+    parser_bench = subparsers.add_parser('bench', help='Rerun every solved day (here, or in the year directories under here), check the answers and compare the timings with the previous bench.')
+    parser_bench.add_argument('years', nargs='*', type=int, help='which years to bench (default: the current directory if it has solutions, otherwise every year directory)')
+    parser_bench.add_argument('--jobs', type=int, default=None, help='how many solutions to run at once (default: the number of cores)')
+    parser_bench.add_argument('--threshold', type=float, default=None, help='flag days more than this fraction slower than the previous bench (default 0.2)')
+    parser_bench.add_argument('--json', action='store_true', help='print the results as JSON instead of a table')
+    add_limit_arguments(parser_bench)
+    parser_bench.set_defaults(func = bench)
+
+    parser_watch = subparsers.add_parser('watch', help='Rerun the example(s), then the real input, every time the solution or an input is saved.')
+    parser_watch.add_argument('year', nargs='?', default=None)
+    parser_watch.add_argument('day', nargs='?', default=None)
+    parser_watch.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE_SECONDS, help='seconds to wait for more saves before rerunning')
+    add_limit_arguments(parser_watch)
+    parser_watch.set_defaults(func = watch)
+
     # submit
     parser_submit = subparsers.add_parser('submit', help='submit the answer: `aoc submit 1` to submit part 1 for the day')
     parser_submit.add_argument('level', nargs='?', default=None)
@@ -403,6 +1202,12 @@ def main():
     parser_submit.add_argument('answer', nargs='?', default=None)
     parser_submit.set_defaults(func = submit)
 
+    parser_clean_cache = subparsers.add_parser('clean-cache', help='Evict old entries from the aoc_cli.memo and aoc_cli.input caches (downloaded puzzles are kept).')
+    parser_clean_cache.add_argument('--max-mb', type=float, default=None, help='evict the least recently used entries until each cache is under this size (default 1024)')
+    parser_clean_cache.add_argument('--max-age-days', type=float, default=None, help='evict entries not used in this many days (default 14)')
+    parser_clean_cache.add_argument('--all', action='store_true', help='delete everything in them')
+    parser_clean_cache.set_defaults(func = clean_cache)
+
     # debug
     parser_debug = subparsers.add_parser('debug')
     parser_debug.set_defaults(func = debug)
@@ -0,0 +1,252 @@
+# A pre-warmed interpreter that forks a child per solution run.
+# `aoc forkserver` starts it in the puzzle directory. It imports everything boilerplate.py imports,
+# then listens on a unix socket. `aoc run` / `aoc test` use it if it's reachable, and fall back to
+# spawning `python -u dayN.py` otherwise.
+#
+# Protocol: the client sends a json request along with 3 fds (stdin, stdout, stderr for the child).
+# The server forks, and replies with a json line {"pid", "startup"}. When the child exits it replies
+# with a second json line {"returncode", "utime", "stime", "maxrss"}.
+import ast
+import json
+import os
+import runpy
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import time
+import traceback
+
+from aoc_cli import limits
+
+SOCKET_PATH = '.aoc_forkserver.sock'
+
+def get_boilerplate_imports(boilerplate_path):
+    """Names of the top-level modules imported by the boilerplate file."""
+    with open(boilerplate_path, 'r') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+def measure_cold_startup(modules):
+    """How long a fresh `python` takes to start up and import the modules. This is what a warm run saves."""
+    start = time.perf_counter()
+    subprocess.run(['python', '-c', ''.join(f'import {m}\n' for m in modules)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+# server ###
+
+def run_child(request, fds):
+    """Runs in the forked child. Never returns."""
+    code = 0
+    try:
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.chdir(request['cwd'])
+        os.environ.update(request.get('env', {}))
+        limits.apply_rlimits(request.get('limits', {}))
+        py_path = os.path.abspath(request['py_path'])
+        sys.argv = [py_path]
+        sys.path[0] = os.path.dirname(py_path)
+        # equivalent of `python -u`
+        sys.stdin = open(0, 'r', closefd=False)
+        sys.stdout = open(1, 'w', buffering=1, closefd=False)
+        sys.stdout.reconfigure(write_through=True)
+        sys.stderr = open(2, 'w', buffering=1, closefd=False)
+        runpy.run_path(py_path, run_name='__main__')
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+def bind(sock_path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    if os.path.exists(sock_path):
+        if connect(sock_path) is not None:
+            raise ValueError(f'a forkserver is already listening on {sock_path}')
+        # stale socket left behind by a server that died
+        os.unlink(sock_path)
+    sock.bind(sock_path)
+    sock.listen()
+    return sock
+
+def serve(boilerplate_path='boilerplate.py', sock_path=SOCKET_PATH):
+    modules = get_boilerplate_imports(boilerplate_path) if os.path.exists(boilerplate_path) else []
+    start = time.perf_counter()
+    for module in modules:
+        try:
+            __import__(module)
+        except ImportError as e:
+            print(f'could not pre-import {module}: {e}')
+    print(f'pre-imported {len(modules)} modules in {time.perf_counter() - start:.2f}s: {" ".join(modules)}')
+    startup = measure_cold_startup(modules)
+    print(f'a cold `python` start takes {startup:.2f}s. Each run through the forkserver saves about that much.')
+
+    listener = bind(sock_path)
+    # wake up the selector when a child exits
+    wakeup_r, wakeup_w = socket.socketpair()
+    wakeup_r.setblocking(False)
+    wakeup_w.setblocking(False)
+    signal.set_wakeup_fd(wakeup_w.fileno())
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    selector.register(wakeup_r, selectors.EVENT_READ)
+    children = {}  # pid -> client connection
+    print(f'forkserver listening on {sock_path}. Ctrl-C to stop.')
+    try:
+        while True:
+            for key, _ in selector.select():
+                if key.fileobj is listener:
+                    conn, _ = listener.accept()
+                    try:
+                        msg, fds, _, _ = socket.recv_fds(conn, 4096, 3)
+                        request = json.loads(msg)
+                    except (OSError, ValueError):
+                        conn.close()
+                        continue
+                    pid = os.fork()
+                    if pid == 0:
+                        signal.set_wakeup_fd(-1)
+                        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                        signal.signal(signal.SIGINT, signal.default_int_handler)
+                        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                        listener.close()
+                        conn.close()
+                        run_child(request, fds)
+                    for fd in fds:
+                        os.close(fd)
+                    children[pid] = conn
+                    conn.sendall((json.dumps({'pid': pid, 'startup': startup}) + '\n').encode())
+                    # the client sends nothing more, so the connection becomes readable only when the client goes away
+                    selector.register(conn, selectors.EVENT_READ, pid)
+                elif key.data is not None:
+                    # the client died (e.g. Ctrl-C) before its child exited, and it was the one enforcing the limits
+                    try:
+                        gone = not key.fileobj.recv(4096)
+                    except OSError:
+                        gone = True
+                    if gone:
+                        selector.unregister(key.fileobj)
+                        if key.data in children:
+                            try:
+                                os.kill(key.data, signal.SIGKILL)
+                            except ProcessLookupError:
+                                pass
+                else:
+                    try:
+                        while wakeup_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+            # reap every child that has exited
+            while children:
+                pid, status, rusage = os.wait4(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                conn = children.pop(pid, None)
+                if conn is not None:
+                    try:
+                        selector.unregister(conn)
+                    except KeyError:
+                        pass
+                    reply = {
+                        'returncode': os.waitstatus_to_exitcode(status),
+                        'utime': rusage.ru_utime,
+                        'stime': rusage.ru_stime,
+                        'maxrss': rusage.ru_maxrss,
+                    }
+                    try:
+                        conn.sendall((json.dumps(reply) + '\n').encode())
+                    except OSError:
+                        pass
+                    conn.close()
+    except KeyboardInterrupt:
+        print('\nstopping forkserver')
+    finally:
+        listener.close()
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+
+# client ###
+
+def connect(sock_path=SOCKET_PATH):
+    """Returns a socket connected to the forkserver, or None if there isn't one listening."""
+    if not os.path.exists(sock_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(sock_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+class WarmPopen:
+    """Like `subprocess.Popen(['python', '-u', py_path], stdin=input_file, stdout=PIPE, stderr=PIPE)`,
+    but forked from the warm server."""
+    def __init__(self, sock, py_path, input_file, limits=None, env=None):
+        start = time.perf_counter()
+        self.sock = sock
+        self.returncode = None
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        try:
+            request = json.dumps({'py_path': py_path, 'cwd': os.getcwd(), 'limits': limits or {}, 'env': env or {}}).encode()
+            socket.send_fds(sock, [request], [input_file.fileno(), stdout_w, stderr_w])
+        finally:
+            os.close(stdout_w)
+            os.close(stderr_w)
+        self.stdout = open(stdout_r, 'rb', buffering=0)
+        self.stderr = open(stderr_r, 'rb', buffering=0)
+        self.replies = sock.makefile('r')
+        hello = json.loads(self.replies.readline())
+        self.pid = hello['pid']
+        self.startup_saved = hello['startup'] - (time.perf_counter() - start)
+
+    def send_signal(self, signum):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    def wait(self):
+        if self.returncode is None:
+            reply = json.loads(self.replies.readline())
+            self.returncode = reply['returncode']
+            # the server reaps the child, so it sends along the child's resource usage
+            self.rusage = {key: reply[key] for key in ['utime', 'stime', 'maxrss']}
+            self.replies.close()
+            self.sock.close()
+        return self.returncode
+
+if __name__ == '__main__':
+    serve()
@@ -0,0 +1,142 @@
+# Fast parsing of puzzle inputs, for solutions to import:
+#
+#     from aoc_cli import input as aoc_input
+#     nums = aoc_input.ints()
+#     grid = aoc_input.grid()
+#
+# Everything reads stdin by default (which `aoc run` points at dayN_example.in / dayN_real.in), or takes a path.
+# When the input is a file, it's memory-mapped rather than copied. The results of ints, int_lines, grid and blocks
+# are pickled under ~/.cache/aoc_cli/parsed, keyed by a hash of the input, so rerunning on the same input skips the parsing.
+# numpy is only imported if you ask for an array.
+import hashlib
+import mmap
+import os
+import pickle
+import re
+import stat
+import sys
+
+from aoc_cli import cache
+
+INT_PATTERN = re.compile(rb'-?\d+')
+UNSIGNED_INT_PATTERN = re.compile(rb'\d+')
+# bump this when a parser's output changes, so that old cached results aren't used
+CACHE_VERSION = 1
+_data = {}
+
+def get_parsed_dir():
+    return os.path.join(cache.get_cache_dir(), 'parsed')
+
+def raw(path=None):
+    """The input's bytes: an mmap if it's a regular file, otherwise (e.g. a pipe) the bytes read from it. Read once per process."""
+    if path in _data:
+        return _data[path]
+    f = open(path, 'rb') if path is not None else sys.stdin.buffer
+    try:
+        if stat.S_ISREG(os.fstat(f.fileno()).st_mode) and os.fstat(f.fileno()).st_size > 0:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+    finally:
+        if path is not None:
+            f.close()
+    _data[path] = data
+    return data
+
+def text(path=None):
+    return bytes(raw(path)).decode()
+
+def lines(path=None):
+    return text(path).splitlines()
+
+def _cached(kind, path, parse):
+    """parse(data), going through the on-disk cache of parsed inputs."""
+    data = raw(path)
+    digest = hashlib.sha256(data).hexdigest()
+    cache_path = os.path.join(get_parsed_dir(), f'{digest}-{kind}-v{CACHE_VERSION}.pickle')
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        pass
+    result = parse(data)
+    cache.write_atomic(cache_path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    return result
+
+def ints(path=None, array=False, signed=True):
+    """Every integer in the input, in order. With array=True, as an int64 numpy array.
+    A leading - counts as a minus sign unless signed=False (for inputs with ranges like 3-7)."""
+    pattern = INT_PATTERN if signed else UNSIGNED_INT_PATTERN
+    kind = 'ints' if signed else 'unsigned-ints'
+    if array:
+        def parse(data):
+            import numpy as np
+            return np.array(list(map(int, pattern.findall(data))), dtype=np.int64)
+        return _cached(f'{kind}-array', path, parse)
+    return _cached(kind, path, lambda data: list(map(int, pattern.findall(data))))
+
+def int_lines(path=None, signed=True):
+    """The integers on each line, as a list of lists."""
+    pattern = INT_PATTERN if signed else UNSIGNED_INT_PATTERN
+    kind = 'int-lines' if signed else 'unsigned-int-lines'
+    return _cached(kind, path, lambda data: [list(map(int, pattern.findall(line))) for line in bytes(data).splitlines()])
+
+def blocks(path=None):
+    """The input split on blank lines, as a list of strings."""
+    return _cached('blocks', path, lambda data: [block for block in re.split(r'\n(?:[ \t]*\n)+', bytes(data).decode().strip('\n')) if block])
+
+class Grid:
+    """A rectangular grid of characters, stored row by row in one bytearray (without the newlines)."""
+    def __init__(self, data, width, height):
+        self.data = data
+        self.width = width
+        self.height = height
+
+    def __getitem__(self, pos):
+        r, c = pos
+        return chr(self.data[r * self.width + c])
+
+    def __setitem__(self, pos, char):
+        r, c = pos
+        self.data[r * self.width + c] = ord(char)
+
+    def __contains__(self, pos):
+        r, c = pos
+        return 0 <= r < self.height and 0 <= c < self.width
+
+    def find(self, char):
+        """(row, column) of the first occurrence of char, or None."""
+        i = self.data.find(char.encode())
+        return divmod(i, self.width) if i >= 0 else None
+
+    def find_all(self, char):
+        target = ord(char)
+        return [divmod(i, self.width) for i, value in enumerate(self.data) if value == target]
+
+    def rows(self):
+        return [self.data[r * self.width:(r + 1) * self.width].decode() for r in range(self.height)]
+
+def _grid_shape(data):
+    body = bytes(data).rstrip(b'\n')
+    width = body.find(b'\n')
+    if width < 0:
+        width = len(body)
+    height = body.count(b'\n') + 1
+    if len(body) != height * (width + 1) - 1:
+        raise ValueError('the input is not a rectangular grid')
+    return body, width, height
+
+def grid(path=None, array=False):
+    """The input as a Grid, or with array=True as a (rows, columns) uint8 numpy array of the characters' byte values."""
+    if array:
+        def parse(data):
+            import numpy as np
+            body, width, height = _grid_shape(data)
+            # view each row plus its newline, then drop the newline column
+            flat = np.frombuffer(body + b'\n', dtype=np.uint8)
+            return flat.reshape(height, width + 1)[:, :width].copy()
+        return _cached('grid-array', path, parse)
+    def parse(data):
+        body, width, height = _grid_shape(data)
+        return Grid(bytearray(body.replace(b'\n', b'')), width, height)
+    return _cached('grid', path, parse)
@@ -0,0 +1,130 @@
+# A record of every answer submitted, per (token owner, year, day, level).
+# Lets us refuse answers that can't be right without asking the server (already rejected, or outside
+# the bounds from earlier "too high"/"too low" responses), and hold submissions until the server's cooldown is over.
+import json
+import os
+import re
+import time
+
+from aoc_cli import cache
+
+RIGHT = 'right'
+WRONG = 'wrong'
+TOO_HIGH = 'too high'
+TOO_LOW = 'too low'
+WAIT = 'wait'
+ALREADY_SOLVED = 'already solved'
+UNKNOWN = 'unknown'
+
+def get_ledger_path():
+    config_dir = os.environ.get('XDG_CONFIG_HOME', os.path.join(os.path.expanduser('~'), '.config'))
+    return os.path.join(config_dir, 'aoc_cli', 'submissions.json')
+
+def load():
+    try:
+        with open(get_ledger_path(), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save(ledger):
+    cache.write_atomic(get_ledger_path(), json.dumps(ledger, indent=1).encode())
+
+def make_key(owner, year, day, level):
+    return f'{owner}/{year}/{day}/{level}'
+
+def get_entry(ledger, owner, year, day, level):
+    return ledger.setdefault(make_key(owner, year, day, level), {
+        'submissions': [],
+        'correct': None,
+        'low': None,  # highest answer that was too low
+        'high': None,  # lowest answer that was too high
+        'wait_until': 0,
+    })
+
+def parse_wait_seconds(article):
+    """How long the response says to wait before submitting again, if it says."""
+    # "You have 37s left to wait." / "You have 1m 5s left to wait."
+    match = re.search(r'You have (?:(\d+)m )?(\d+)s left to wait', article)
+    if match:
+        return int(match.group(1) or 0) * 60 + int(match.group(2))
+    # "Please wait one minute before trying again." / "please wait 5 minutes before trying again."
+    match = re.search(r'wait (one|\d+) minutes? before trying again', article, re.IGNORECASE)
+    if match:
+        return 60 * (1 if match.group(1) == 'one' else int(match.group(1)))
+    return None
+
+def parse_response(article):
+    if "That's the right answer" in article:
+        return RIGHT
+    if "You don't seem to be solving the right level" in article:
+        return ALREADY_SOLVED
+    if 'You gave an answer too recently' in article:
+        return WAIT
+    if "That's not the right answer" in article:
+        if 'your answer is too high' in article:
+            return TOO_HIGH
+        if 'your answer is too low' in article:
+            return TOO_LOW
+        return WRONG
+    return UNKNOWN
+
+def as_int(answer):
+    try:
+        return int(answer)
+    except ValueError:
+        return None
+
+def check(owner, year, day, level, answer):
+    """Returns the reason the answer can't be right, or None if it's worth submitting."""
+    entry = get_entry(load(), owner, year, day, level)
+    if entry['correct'] is not None:
+        if entry['correct'] == answer:
+            return f'{answer} was already accepted as the right answer'
+        return f'this level was already solved with {entry["correct"]}'
+    for submission in entry['submissions']:
+        if submission['answer'] == answer and submission['result'] in [WRONG, TOO_HIGH, TOO_LOW]:
+            return f'{answer} was already submitted, and it was {submission["result"]}'
+    value = as_int(answer)
+    if value is not None:
+        if entry['low'] is not None and value <= entry['low']:
+            return f'{answer} is too low: {entry["low"]} was already too low'
+        if entry['high'] is not None and value >= entry['high']:
+            return f'{answer} is too high: {entry["high"]} was already too high'
+    return None
+
+def correct_answers(owner, year, day):
+    """{level: the answer the server accepted} for the levels of the day that are solved."""
+    ledger = load()
+    correct = {}
+    for level in [1, 2]:
+        answer = get_entry(ledger, owner, year, day, level)['correct']
+        if answer is not None:
+            correct[level] = answer
+    return correct
+
+def wait_for_cooldown(owner, year, day, level):
+    """Block until the server will accept another answer."""
+    entry = get_entry(load(), owner, year, day, level)
+    while time.time() < entry['wait_until']:
+        print(f'waiting {entry["wait_until"] - time.time():.0f}s for the submission cooldown', end='\r')
+        time.sleep(min(1, max(0, entry['wait_until'] - time.time())))
+
+def record(owner, year, day, level, answer, article):
+    """Update the ledger with the server's response to submitting answer. Returns the parsed result."""
+    result = parse_response(article)
+    ledger = load()
+    entry = get_entry(ledger, owner, year, day, level)
+    entry['submissions'].append({'answer': answer, 'result': result, 'time': time.time()})
+    value = as_int(answer)
+    if result == RIGHT:
+        entry['correct'] = answer
+    elif result == TOO_LOW and value is not None:
+        entry['low'] = value if entry['low'] is None else max(entry['low'], value)
+    elif result == TOO_HIGH and value is not None:
+        entry['high'] = value if entry['high'] is None else min(entry['high'], value)
+    wait_seconds = parse_wait_seconds(article)
+    if wait_seconds is not None:
+        entry['wait_until'] = time.time() + wait_seconds
+    save(ledger)
+    return result
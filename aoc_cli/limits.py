@@ -0,0 +1,110 @@
+# Resource limits for solution runs, so that a runaway brute force doesn't take the machine down with it.
+# limits is a dict with any of:
+#   timeout: wall-clock seconds. enforced by the runner, which terminates the child.
+#   cpu_limit: CPU seconds. enforced by the kernel (RLIMIT_CPU).
+#   memory_limit: address space in MB. enforced by the kernel (RLIMIT_AS); python raises MemoryError.
+#   output_limit: MB of stdout + stderr. enforced by the runner, which terminates the child.
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+LIMITS = {
+    'timeout': 'wall-clock time limit of {}s',
+    'cpu_limit': 'CPU time limit of {}s',
+    'memory_limit': 'memory limit of {}MB',
+    'output_limit': 'output limit of {}MB',
+}
+# how long a terminated child gets to exit before it's killed
+GRACE_SECONDS = 1
+
+def describe(limits, name):
+    return LIMITS[name].format(limits[name])
+
+def apply_rlimits(limits, pid=None):
+    """Set the kernel-enforced limits on process pid (with prlimit), or on the current process if pid is None."""
+    import resource
+    rlimits = []
+    if limits.get('cpu_limit') is not None:
+        seconds = int(limits['cpu_limit'])
+        # SIGXCPU at the soft limit, SIGKILL a second later if that didn't do it
+        rlimits.append((resource.RLIMIT_CPU, (seconds, seconds + 1)))
+    if limits.get('memory_limit') is not None:
+        nbytes = int(limits['memory_limit'] * 2**20)
+        rlimits.append((resource.RLIMIT_AS, (nbytes, nbytes)))
+    for rlimit, values in rlimits:
+        if pid is None:
+            resource.setrlimit(rlimit, values)
+        else:
+            try:
+                resource.prlimit(pid, rlimit, values)
+            except ProcessLookupError:
+                # it already exited
+                pass
+
+def can_limit_other_processes():
+    """Whether apply_rlimits can take a pid (prlimit is linux only)."""
+    import resource
+    return hasattr(resource, 'prlimit')
+
+def limited_command(cmd, limits):
+    """cmd, run through a small python that sets the limits on itself and then execs cmd.
+    For platforms without prlimit, since setting them in a preexec_fn isn't safe when the runner has threads."""
+    wrapper = 'import json, os, sys; from aoc_cli import limits; limits.apply_rlimits(json.loads(sys.argv[1])); os.execvp(sys.argv[2], sys.argv[2:])'
+    return [sys.executable, '-c', wrapper, json.dumps(limits)] + cmd
+
+class Popen(subprocess.Popen):
+    """A Popen whose signals go straight to the pid. The runner reaps children itself with os.wait4 (to get their rusage),
+    and subprocess.Popen.send_signal polls first, which could reap the child out from under it.
+    The pid can't be reused until it's reaped, so signalling an exited child is harmless."""
+    def send_signal(self, sig):
+        if self.returncode is None:
+            os.kill(self.pid, sig)
+
+def stop(popen):
+    """Terminate the child, and kill it if it's still around after GRACE_SECONDS."""
+    popen.terminate()
+    killer = threading.Timer(GRACE_SECONDS, popen.kill)
+    killer.daemon = True
+    killer.start()
+    return killer
+
+class Watchdog:
+    """Enforces the limits the runner is responsible for (timeout and output_limit) on a running child."""
+    def __init__(self, popen, limits):
+        self.popen = popen
+        self.limits = limits
+        self.tripped = None
+        self.timers = []
+        self.lock = threading.Lock()
+        if limits.get('timeout') is not None:
+            timer = threading.Timer(limits['timeout'], self.trip, ['timeout'])
+            timer.daemon = True
+            timer.start()
+            self.timers.append(timer)
+
+    def trip(self, name):
+        with self.lock:
+            if self.tripped is not None:
+                return
+            self.tripped = name
+        self.timers.append(stop(self.popen))
+
+    def check_output(self, total_bytes):
+        if self.limits.get('output_limit') is not None and total_bytes > self.limits['output_limit'] * 2**20:
+            self.trip('output_limit')
+
+    def done(self, returncode, utime, stime, stderr_tail):
+        """Stop the timers, and work out which limit (if any) stopped the child."""
+        for timer in self.timers:
+            timer.cancel()
+        if self.tripped is not None:
+            return self.tripped
+        cpu_limit = self.limits.get('cpu_limit')
+        if cpu_limit is not None and returncode in [-signal.SIGXCPU, -signal.SIGKILL] and utime + stime >= int(cpu_limit) - 0.1:
+            return 'cpu_limit'
+        if self.limits.get('memory_limit') is not None and returncode != 0 and 'MemoryError' in stderr_tail:
+            return 'memory_limit'
+        return None
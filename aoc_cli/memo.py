@@ -0,0 +1,168 @@
+# Persistent memoization for solutions, so that part 2 (or the next run of part 1) can reuse expensive work:
+#
+#     from aoc_cli import memo
+#
+#     @memo.persist
+#     def build_graph(lines):
+#         ...
+#
+# Results are pickled under ~/.cache/aoc_cli/memo, keyed by the function's source, its arguments and the content of
+# the input the solution is running on. Only the decorated function's own source is hashed, so if you change
+# a helper it calls, use `aoc clean-cache --all` (or pass input=False and change the arguments).
+# `aoc run` and `aoc test` print how many calls hit the cache and roughly how much time that saved.
+# Entries not used for MAX_AGE_DAYS are evicted, and then the least recently used ones until the total is under MAX_BYTES.
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import stat
+import time
+
+from aoc_cli import cache
+
+MAX_BYTES = 2**30
+MAX_AGE_DAYS = 14
+# the runner sets these: where to write this process's hit/miss counts, and the hash of the input file
+STATS_ENV = 'AOC_MEMO_STATS'
+INPUT_HASH_ENV = 'AOC_INPUT_HASH'
+# set by `aoc bench` and `aoc race`, which time the solution itself: every call is computed, and nothing is read or stored
+DISABLE_ENV = 'AOC_MEMO_DISABLE'
+
+stats = {'hits': 0, 'misses': 0, 'unkeyable': 0, 'saved': 0.0}
+_input_hash = None
+_evicted = False
+
+def get_memo_dir():
+    return os.path.join(cache.get_cache_dir(), 'memo')
+
+def get_input_hash():
+    """The sha256 of the input the solution is running on, or '' if it can't be known without consuming stdin."""
+    global _input_hash
+    if _input_hash is None:
+        _input_hash = os.environ.get(INPUT_HASH_ENV, '')
+        try:
+            stdin_is_file = stat.S_ISREG(os.fstat(0).st_mode)
+        except OSError:
+            stdin_is_file = False
+        if not _input_hash and stdin_is_file:
+            # (mapping it doesn't move stdin's position, so the solution can still read it)
+            from aoc_cli import input as aoc_input
+            _input_hash = hashlib.sha256(aoc_input.raw()).hexdigest()
+    return _input_hash
+
+def get_source_hash(fn):
+    try:
+        source = inspect.getsource(fn).encode()
+    except (OSError, TypeError):
+        source = fn.__code__.co_code
+    return hashlib.sha256(source).hexdigest()
+
+def normalize(value):
+    """value with every set and frozenset (inside lists, tuples and dicts too) replaced by a sorted tuple.
+    A set's iteration order, and so its pickle, changes between processes with string hash randomization.
+    Sets inside other objects aren't reached, so calls with those never hit the cache."""
+    if isinstance(value, (set, frozenset)):
+        items = [normalize(item) for item in value]
+        items.sort(key=lambda item: pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL))
+        return ('set', type(value).__name__, tuple(items))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(normalize(item) for item in value))
+    if isinstance(value, dict):
+        return ('dict', tuple((normalize(k), normalize(v)) for k, v in value.items()))
+    return value
+
+def save_stats():
+    """Write the counts where the runner can find them. Done after every call, since forkserver children don't run atexit."""
+    path = os.environ.get(STATS_ENV)
+    if path:
+        with open(path, 'w') as f:
+            json.dump(stats, f)
+
+def persist(fn=None, *, input=True):
+    """Decorator: cache fn's results on disk. With input=False, the key doesn't include the input's content."""
+    if fn is None:
+        return functools.partial(persist, input=input)
+    source_hash = get_source_hash(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if os.environ.get(DISABLE_ENV):
+            return fn(*args, **kwargs)
+        try:
+            arguments = pickle.dumps(normalize((args, sorted(kwargs.items()))), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            arguments = None
+        if arguments is None:
+            # arguments we can't key on: just call it
+            stats['unkeyable'] += 1
+            save_stats()
+            return fn(*args, **kwargs)
+        key = hashlib.sha256(b'\0'.join([source_hash.encode(), (get_input_hash() if input else '').encode(), arguments])).hexdigest()
+        path = os.path.join(get_memo_dir(), f'{fn.__qualname__}-{key[:32]}.pickle')
+        start = time.perf_counter()
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            entry = None
+        if entry is not None:
+            # mark it as recently used, for eviction
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # another solution process evicted it after we read it; the value is still good
+                pass
+            stats['hits'] += 1
+            stats['saved'] += max(0.0, entry['seconds'] - (time.perf_counter() - start))
+            save_stats()
+            return entry['value']
+        result = fn(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        stats['misses'] += 1
+        try:
+            data = pickle.dumps({'value': result, 'seconds': seconds}, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            data = None
+        if data is not None:
+            cache.write_atomic(path, data)
+            global _evicted
+            if not _evicted:
+                _evicted = True
+                evict(get_memo_dir())
+        save_stats()
+        return result
+    return wrapper
+
+def evict(directory, max_bytes=MAX_BYTES, max_age_days=MAX_AGE_DAYS):
+    """Delete the files in directory that weren't used for max_age_days, then the least recently used ones until
+    they add up to at most max_bytes. Returns (files deleted, bytes freed)."""
+    entries = []
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0, 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            entries.append((st.st_mtime, st.st_size, path))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    cutoff = time.time() - max_age_days * 86400
+    deleted, freed = 0, 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        deleted += 1
+        freed += size
+    return deleted, freed
@@ -0,0 +1,60 @@
+# Regression check + benchmark for the example parsers, using the bundled example_* fixtures.
+#     python -m aoc_cli.parse_example.benchmark           # heuristic only
+#     python -m aoc_cli.parse_example.benchmark --llm     # also the LLM (uses your configured OpenAI key, costs money)
+# Exits non-zero if the heuristic gets any fixture wrong.
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from aoc_cli.parse_example import heuristic
+from aoc_cli.parse_example.parse_example import EXAMPLES
+
+def load_fixture(example):
+    directory = Path(__file__).parent
+    def read(extension):
+        with open(directory / f'{example}.{extension}', 'r') as f:
+            return f.read()
+    return read('in'), read('real'), read('out'), read('answer')
+
+def check(parsed, expected_input, expected_answer):
+    return parsed is not None and parsed['Example Input'].strip() == expected_input.strip() and parsed['Example Answer'].strip() == expected_answer.strip()
+
+def bench_heuristic(description, real_input, repeat=100):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parsed, confidence = heuristic.extract(description, real_input)
+    return parsed, confidence, (time.perf_counter() - start) / repeat
+
+def bench_llm(openai_key, description, real_input):
+    from aoc_cli.parse_example import parse_example
+    start = time.perf_counter()
+    parsed = json.loads(parse_example.go(openai_key, description, real_input, use_cache=False))
+    return parsed, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--llm', action='store_true', help='also benchmark the LLM parser')
+    args = parser.parse_args()
+    if args.llm:
+        from aoc_cli.command_line import get_openai_key_from_config
+        openai_key = get_openai_key_from_config()
+
+    failures = 0
+    print(f'{"fixture":<12} {"parser":<10} {"correct":<8} {"confidence":<11} {"latency":>10}')
+    for example in EXAMPLES:
+        description, real_input, expected_input, expected_answer = load_fixture(example)
+        parsed, confidence, latency = bench_heuristic(description, real_input)
+        correct = check(parsed, expected_input, expected_answer)
+        failures += not correct
+        print(f'{example:<12} {"heuristic":<10} {str(correct):<8} {confidence:<11.2f} {latency * 1000:>8.3f}ms')
+        if args.llm:
+            parsed, latency = bench_llm(openai_key, description, real_input)
+            correct = check(parsed, expected_input, expected_answer)
+            print(f'{example:<12} {"llm":<10} {str(correct):<8} {"":<11} {latency * 1000:>8.0f}ms')
+    print(f'heuristic got {len(EXAMPLES) - failures}/{len(EXAMPLES)} correct')
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# Parse the example out of the puzzle description without asking an LLM.
+# Most puzzles look like:
+#     ... For example:
+#     <pre><code>the example input</code></pre>
+#     ... so the answer is <code><em>42</em></code>.
+# so the first code block after "For example" is the input, and the last emphasized code is the answer.
+# extract() also returns a confidence score, so that the caller can fall back to the LLM when the puzzle doesn't fit the mold.
+import html
+import re
+
+CODE_BLOCK = re.compile(r'<pre><code>(.*?)</code></pre>', re.DOTALL)
+# the answer is usually <code><em>42</em></code>, but sometimes <em><code>42</code></em>
+ANSWER = re.compile(r'<code><em>(.*?)</em></code>|<em><code>(.*?)</code></em>', re.DOTALL)
+FOR_EXAMPLE = re.compile(r'for example', re.IGNORECASE)
+# descriptions are decoded with formatter=None, so a bare < in the text is a literal <.
+# only strip the inline tags AoC actually uses inside code.
+INLINE_TAG = re.compile(r'</?(?:em|span|code|b|i|a)(?:\s[^>]*)?>')
+
+def clean(text):
+    return html.unescape(INLINE_TAG.sub('', text))
+
+def extract(description: str, real_input: str = ''):
+    """Returns ({"Example Input": ..., "Example Answer": ...}, confidence), or (None, 0) if nothing looks like an example.
+    confidence is in [0, 1]. real_input is optional; if given, it's used as a sanity check on the example's character set."""
+    blocks = list(CODE_BLOCK.finditer(description))
+    answers = list(ANSWER.finditer(description))
+    if not blocks or not answers:
+        return None, 0
+    confidence = 0
+    for_example = FOR_EXAMPLE.search(description)
+    after_for_example = [block for block in blocks if for_example and block.start() > for_example.start()]
+    if after_for_example:
+        block = after_for_example[0]
+        confidence += 0.5
+    else:
+        block = blocks[0]
+        confidence += 0.2
+    answer = answers[-1]
+    if answer.start() > block.end():
+        confidence += 0.3
+    answer_text = clean(answer.group(1) if answer.group(1) is not None else answer.group(2)).strip()
+    example_input = clean(block.group(1)).rstrip('\n')
+    if '\n' not in answer_text and len(answer_text) < 100:
+        confidence += 0.1
+    if real_input.strip():
+        # the example should be made of the same stuff as the real input
+        if set(example_input) - set(real_input) <= {' ', '\n'}:
+            confidence += 0.1
+        else:
+            confidence -= 0.3
+    confidence = max(0, min(1, confidence))
+    return {'Example Input': example_input, 'Example Answer': answer_text}, confidence
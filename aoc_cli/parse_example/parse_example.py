@@ -6,53 +6,124 @@
 # Ask it for the example input.
 
 # WIP
+import functools
+import hashlib
+import json
+import os
+import re
 from pathlib import Path
 
-from openai import OpenAI
+from aoc_cli import cache
 
 # FILE_EXTENSIONS = ['in', 'out', 'real', 'answer']
 EXAMPLES = ['example_1', 'example_2', 'example_3']
+# rough budget for how much of the user's real input goes into the prompt. ~4 characters per token.
+REAL_INPUT_TOKEN_BUDGET = 400
+CHARS_PER_TOKEN = 4
 
 
-def go(openai_key, puzzle_description: str, real_input: str, truncate_real = True):
-    N = 10
-    client = OpenAI(
-        api_key=openai_key, 
-    )
-    ins = []
-    outs = []
+def truncate(real, N=10):
+    # truncate to the first 1250 characters,
+    # and the first N lines.
+    first_m = real[:1250]
+    if len(real) >= 1250:
+        first_m += ' ...'
+    return '\n'.join(first_m.split('\n')[:N])
+
+def sample_real_input(real_input, token_budget=REAL_INPUT_TOKEN_BUDGET):
+    """The head of the real input plus a few lines from further in, within roughly token_budget tokens.
+    The model only needs to see what the input looks like, not all of it."""
+    budget = token_budget * CHARS_PER_TOKEN
+    if len(real_input) <= budget:
+        return real_input
+    lines = real_input.split('\n')
+    # cut very long lines (one-line inputs are common) so that at least some of each line fits
+    max_line = budget // 2
+    head = []
+    used = 0
+    for line in lines:
+        line = line[:max_line]
+        if used + len(line) + 1 > budget * 3 // 4:
+            break
+        head.append(line)
+        used += len(line) + 1
+    # a few evenly spaced lines from the rest, to show the variety
+    rest = lines[len(head):]
+    samples = []
+    for line in rest[len(rest) // 4::max(1, len(rest) // 4)]:
+        line = line[:max_line]
+        if used + len(line) + 5 > budget:
+            break
+        samples.append(line)
+        used += len(line) + 5
+    sampled = '\n'.join(head) + '\n...\n'
+    if samples:
+        sampled += '\n...\n'.join(samples) + '\n...\n'
+    return sampled + f'({len(lines)} lines in total)'
+
+@functools.lru_cache(maxsize=None)
+def few_shot_messages(truncate_real=True):
+    """The few-shot part of the prompt. It only depends on the bundled fixtures, so it's built once."""
+    messages = []
     for example in EXAMPLES:
         inp = open(Path(__file__).parent / f'{example}.in').read()
         real = open(Path(__file__).parent / f'{example}.real').read()
         if truncate_real:
-            # truncate to the first 1250 characters,
-            # and the first N lines.
-            first_m = real[:1250]
-            if len(real) >= 1250:
-                first_m += ' ...'
-            real = '\n'.join(first_m.split('\n')[:N])
+            real = truncate(real)
         answer = open(Path(__file__).parent / f'{example}.answer').read()
         out = open(Path(__file__).parent / f'{example}.out').read()
-        ins.append(f'Puzzle Description:\n{inp}\n\nReal Input:\n{real}')
-        outs.append(f'{{"Example Input": "{out}", "Example Answer":"{answer}"}}')
+        messages.append({"role": "user", "content": f'Puzzle Description:\n{inp}\n\nReal Input:\n{real}'})
+        messages.append({"role": "assistant", "content": json.dumps({"Example Input": out, "Example Answer": answer})})
+    return tuple(messages)
 
-    ins.append(f'Puzzle Description:\n{puzzle_description}\n\nReal Input:\n{real_input}')
+def get_parse_cache_path(puzzle_description):
+    digest = hashlib.sha256(puzzle_description.encode()).hexdigest()
+    return os.path.join(cache.get_cache_dir(), 'parsed_examples', f'{digest}.json')
 
-    real_input_description= "Real Input" if truncate_real else f"(possibly truncated) Real Input",
-    response = client.chat.completions.create(
+# matches the complete "Example Input" string in a (possibly partial) JSON response
+EXAMPLE_INPUT_FIELD = re.compile(r'"Example Input"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+def go(openai_key, puzzle_description: str, real_input: str, truncate_real = True, on_example_input=None, use_cache=True):
+    """Returns the JSON string {"Example Input": ..., "Example Answer": ...}.
+    The response is streamed, and on_example_input (if given) is called with the example input as soon as that
+    field is complete, before the answer comes in. Results are cached by the description's hash."""
+    cache_path = get_parse_cache_path(puzzle_description)
+    if use_cache and os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            content = f.read()
+        if on_example_input is not None:
+            on_example_input(json.loads(content)['Example Input'])
+        return content
+
+    from openai import OpenAI
+    client = OpenAI(
+        api_key=openai_key,
+    )
+    real_input_description = "(possibly truncated) Real Input" if truncate_real else "Real Input"
+    if truncate_real:
+        real_input = sample_real_input(real_input)
+    stream = client.chat.completions.create(
         model="gpt-4-1106-preview", #"gpt-3.5-turbo",
         response_format={ "type": "json_object" },
+        stream=True,
         messages=[
                 {"role": "system", "content": f"You are an expert parser of Advent of Code puzzles. The user will give you the body of an Advent of Code puzzle description, which contains an Example Input. \
                  You must return only the Example Input. To help, you will also be given the {real_input_description}, which may be much longer. There may be multiple inputs in the body, but the Example Input is the one that has an Example Answer.\
                  Rarely, there may be multiple Example Inputs. In that case, return the first one. Return the Example Input and the Example Answer as a JSON object."},
-                {"role": "user", "content": f"{ins[0]}"},
-                {"role": "assistant", "content": f"{outs[0]}"},
-                {"role": "user", "content": f"{ins[1]}"},
-                {"role": "assistant", "content": f"{outs[1]}"},
-                {"role": "user", "content": f"{ins[2]}"},
-                {"role": "assistant", "content": f"{outs[2]}"},
-                {"role": "user", "content": f"{ins[3]}"}
+                *few_shot_messages(truncate_real),
+                {"role": "user", "content": f'Puzzle Description:\n{puzzle_description}\n\nReal Input:\n{real_input}'}
             ]
     )
-    return response.choices[0].message.content
\ No newline at end of file
+    content = ''
+    for chunk in stream:
+        if not chunk.choices or chunk.choices[0].delta.content is None:
+            continue
+        content += chunk.choices[0].delta.content
+        if on_example_input is not None:
+            match = EXAMPLE_INPUT_FIELD.search(content)
+            if match:
+                on_example_input(json.loads(match.group(1)))
+                on_example_input = None
+    json.loads(content)  # don't cache a broken response
+    cache.write_atomic(cache_path, content.encode())
+    return content
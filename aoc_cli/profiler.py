@@ -0,0 +1,123 @@
+# Runs a solution under a profiler. `aoc profile` runs this file as a script, in the same kind of
+# `python` that `aoc run` uses, with the input as stdin:
+#     python profiler.py [--mode cprofile|sample] [--time-limit S] [--top N] [--collapsed PATH] dayN.py < dayN_real.in
+# It only uses the standard library, so that it works in whatever python the solutions run in.
+#
+# A signal-based stack sampler always runs: it's where the hot lines and the collapsed stacks
+# (for flamegraph.pl / speedscope / inferno) come from. --mode cprofile additionally runs cProfile
+# for exact per-function timings, at the cost of slowing the solution down.
+import argparse
+import collections
+import os
+import runpy
+import signal
+import sys
+
+class TimeLimit(BaseException):
+    """Raised inside the solution when the time limit is hit, so that we can still report the partial profile."""
+
+class Sampler:
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.lines = collections.Counter()
+        self.functions = collections.Counter()
+        self.total = 0
+
+    def handler(self, signum, frame):
+        self.total += 1
+        if frame is None:
+            return
+        self.lines[f'{frame.f_code.co_filename}:{frame.f_lineno}'] += 1
+        stack = []
+        # walk down to the solution's module frame; below that is runpy and this file
+        while frame is not None and 'runpy' not in frame.f_code.co_filename:
+            stack.append(f'{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}')
+            frame = frame.f_back
+        if stack:
+            self.functions[stack[0]] += 1
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        signal.signal(signal.SIGPROF, self.handler)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+    def report(self, top, out):
+        print(f'{self.total} samples every {self.interval * 1000:.1f}ms of CPU time', file=out)
+        print('hot functions (self time):', file=out)
+        for function, count in self.functions.most_common(top):
+            print(f'  {count / self.total * 100:5.1f}%  {function}', file=out)
+        print('hot lines:', file=out)
+        for line, count in self.lines.most_common(top):
+            print(f'  {count / self.total * 100:5.1f}%  {line}', file=out)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('py_path')
+    parser.add_argument('--mode', choices=['cprofile', 'sample'], default='sample')
+    parser.add_argument('--time-limit', type=float, default=None)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--interval', type=float, default=0.001, help='seconds of CPU time between samples')
+    parser.add_argument('--collapsed', default=None, help='write collapsed stacks here')
+    args = parser.parse_args()
+
+    py_path = os.path.abspath(args.py_path)
+    # make it look like `python py_path`
+    sys.argv = [py_path]
+    sys.path[0] = os.path.dirname(py_path)
+    # the report goes to stderr, so that the solution's stdout is the same as usual
+    out = sys.stderr
+
+    def time_limit(signum, frame):
+        raise TimeLimit()
+    if args.time_limit is not None:
+        signal.signal(signal.SIGALRM, time_limit)
+        signal.setitimer(signal.ITIMER_REAL, args.time_limit)
+
+    sampler = Sampler(args.interval)
+    profiler = None
+    if args.mode == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+    stopped_early = False
+    sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        runpy.run_path(py_path, run_name='__main__')
+    except TimeLimit:
+        stopped_early = True
+    except SystemExit:
+        pass
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        sampler.stop()
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        sys.stdout.flush()
+
+    print(file=out)
+    if stopped_early:
+        print(f'stopped after the {args.time_limit}s time limit. This profile is partial.', file=out)
+    if profiler is not None:
+        import pstats
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats('tottime').print_stats(args.top)
+    if sampler.total:
+        sampler.report(args.top, out)
+    else:
+        print('the solution finished before any samples were taken', file=out)
+    if args.collapsed is not None:
+        sampler.write_collapsed(args.collapsed)
+        print(f'wrote collapsed stacks to {args.collapsed}', file=out)
+
+if __name__ == '__main__':
+    main()
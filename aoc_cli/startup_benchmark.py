@@ -0,0 +1,58 @@
+# Startup benchmark for the CLI, to catch regressions like a heavy import sneaking back to module level.
+#     python -m aoc_cli.startup_benchmark
+# Measures the time to import aoc_cli.command_line and the wall time of a few offline subcommands,
+# each in a fresh interpreter with a throwaway config dir. Exits non-zero if any of the heavy modules
+# get imported at startup, or if --max-import-ms is given and the import is slower than that.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# these should only ever be imported by the subcommands that need them
+HEAVY_MODULES = ['requests', 'bs4', 'openai', 'asyncio', 'aoc_cli.forkserver']
+# offline subcommands, so the benchmark doesn't need a network or a session token
+SUBCOMMANDS = [['day', '12'], ['year', '2023'], ['debug']]
+
+def time_command(cmd, env, repeat):
+    """Median wall time of running cmd, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--max-import-ms', type=float, default=None, help='fail if importing the CLI takes longer than this')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        env = dict(os.environ, XDG_CONFIG_HOME=config_dir)
+        baseline = time_command([sys.executable, '-c', 'pass'], env, args.repeat)
+        import_time = time_command([sys.executable, '-c', 'import aoc_cli.command_line'], env, args.repeat) - baseline
+        print(f'{"interpreter startup":<24} {baseline * 1000:>8.1f}ms')
+        print(f'{"import command_line":<24} {import_time * 1000:>8.1f}ms (on top of interpreter startup)')
+        for subcommand in SUBCOMMANDS:
+            wall = time_command([sys.executable, '-m', 'aoc_cli.command_line', *subcommand], env, args.repeat)
+            print(f'{"aoc " + " ".join(subcommand):<24} {wall * 1000:>8.1f}ms')
+
+        check = 'import sys, json, aoc_cli.command_line; print(json.dumps(sorted(sys.modules)))'
+        loaded = set(json.loads(subprocess.run([sys.executable, '-c', check], env=env, check=True, capture_output=True, text=True).stdout))
+    failed = False
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+    if heavy:
+        print(f'FAIL: importing the CLI also imports {", ".join(heavy)}')
+        failed = True
+    if args.max_import_ms is not None and import_time * 1000 > args.max_import_ms:
+        print(f'FAIL: importing the CLI took {import_time * 1000:.1f}ms, more than {args.max_import_ms}ms')
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# Helpers for `aoc sync`, which downloads every released input and description for whole years.
+# Downloads go through the shared session (so connections are reused) and the cache (so nothing is fetched twice),
+# a few at a time, and never faster than a polite rate.
+import datetime
+import threading
+import time
+
+EST = datetime.timezone(datetime.timedelta(hours=-5))
+# from 2025 on, there are 12 puzzles a year instead of 25
+DAYS_BEFORE_2025 = 25
+DAYS_FROM_2025 = 12
+DEFAULT_JOBS = 4
+# requests per second
+DEFAULT_RATE = 2
+
+def release_time(year, day):
+    """Puzzles unlock at midnight EST."""
+    return datetime.datetime(year=int(year), month=12, day=int(day), tzinfo=EST).timestamp()
+
+def released_days(year, now=None):
+    now = time.time() if now is None else now
+    days = DAYS_BEFORE_2025 if int(year) < 2025 else DAYS_FROM_2025
+    return [day for day in range(1, days + 1) if release_time(year, day) <= now]
+
+class RateLimiter:
+    """Spaces calls to wait() at least 1/rate seconds apart, across threads."""
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_time = 0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        time.sleep(start - now)
+
+class TrafficCounter:
+    """A requests response hook that counts requests and bytes downloaded."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes = 0
+
+    def __call__(self, response, *args, **kwargs):
+        with self.lock:
+            self.requests += 1
+            self.bytes += len(response.content)
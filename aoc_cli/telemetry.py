@@ -0,0 +1,83 @@
+# Resource usage of solution runs, and a per-day history of it so that runs can be compared.
+# The history for dayN.py lives next to it in dayN_history.jsonl, one json object per run.
+import hashlib
+import json
+import os
+import sys
+import time
+
+def make_stats(wall, utime, stime, maxrss):
+    # ru_maxrss is in kilobytes on linux, but bytes on macOS
+    maxrss_bytes = maxrss if sys.platform == 'darwin' else maxrss * 1024
+    return {'wall': wall, 'utime': utime, 'stime': stime, 'maxrss': maxrss_bytes}
+
+def format_stats(stats):
+    return f"{stats['wall']:.3f}s wall, {stats['utime']:.3f}s user, {stats['stime']:.3f}s sys, {stats['maxrss'] / 2**20:.1f}MB peak memory"
+
+def hash_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def get_history_path(py_path):
+    return f'{os.path.splitext(py_path)[0]}_history.jsonl'
+
+def run_kind(record):
+    """Runs are only compared with runs of the same kind: forked from the forkserver or not, and with aoc_cli.memo hits or not."""
+    return (record.get('warm', False), record.get('memo_hits', 0) > 0)
+
+def describe_kind(kind):
+    warm, memo_hit = kind
+    return ('warm' if warm else 'cold') + ' run' + (' with memo hits' if memo_hit else '')
+
+def previous_run(py_path, input_hash, interpreter=None, kind=(False, False)):
+    """The most recent successful recorded run of py_path on the input with this hash, with the same interpreter
+    and of the same kind (see run_kind), or None."""
+    history_path = get_history_path(py_path)
+    if not os.path.exists(history_path):
+        return None
+    previous = None
+    with open(history_path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('input_hash') == input_hash and record.get('returncode') == 0 and record.get('interpreter') == interpreter and run_kind(record) == kind:
+                previous = record
+    return previous
+
+def append_history(py_path, record):
+    with open(get_history_path(py_path), 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+def compare(stats, previous):
+    """A human readable comparison of this run with a previous one of the same kind."""
+    if previous['wall'] <= 0:
+        return ''
+    ratio = stats['wall'] / previous['wall']
+    if ratio < 1:
+        change = f'{(1 - ratio) * 100:.0f}% faster than'
+    else:
+        change = f'{(ratio - 1) * 100:.0f}% slower than'
+    return f"{change} the previous {describe_kind(run_kind(previous))} on this input ({previous['wall']:.3f}s)"
+
+def record_run(py_path, input_path, stats, answer, returncode, interpreter=None, warm=False, memo_hits=0):
+    """Append the run to the history, and return the comparison with the previous run of the same kind on the same input (or '').
+    interpreter is None for the default `python`. warm is whether it was forked from the forkserver,
+    and memo_hits how many aoc_cli.memo calls it answered from the cache."""
+    input_hash = hash_file(input_path)
+    record = {
+        'time': time.time(),
+        'input': input_path,
+        'input_hash': input_hash,
+        'answer': answer,
+        'returncode': returncode,
+        'warm': warm,
+        'memo_hits': memo_hits,
+        **stats,
+    }
+    if interpreter is not None:
+        record['interpreter'] = interpreter
+    previous = previous_run(py_path, input_hash, interpreter, run_kind(record))
+    append_history(py_path, record)
+    return compare(stats, previous) if previous is not None else ''
@@ -0,0 +1,106 @@
+# File watching for `aoc watch`. Uses inotify (through ctypes, so no extra dependency) on linux,
+# and falls back to polling mtimes everywhere else.
+# We watch the directory rather than the files, since many editors save by writing a new file and renaming it over the old one.
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+class InotifyWatcher:
+    def __init__(self, directory, names):
+        self.names = set(names)
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch failed')
+
+    def wait(self, timeout=None):
+        """Block until one of the watched files changes (or timeout seconds pass). Returns the names that changed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self.read_events()
+            # events for other files in the directory (like the run history) don't count
+            if changed:
+                return changed
+
+    def read_events(self):
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0').decode(errors='replace')
+            if name in self.names:
+                changed.add(name)
+            offset += EVENT_HEADER.size + length
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    INTERVAL = 0.1
+
+    def __init__(self, directory, names):
+        self.paths = {name: os.path.join(directory, name) for name in names}
+        self.mtimes = self.stat()
+
+    def stat(self):
+        mtimes = {}
+        for name, path in self.paths.items():
+            try:
+                st = os.stat(path)
+                mtimes[name] = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                mtimes[name] = None
+        return mtimes
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            mtimes = self.stat()
+            changed = {name for name in mtimes if mtimes[name] != self.mtimes[name]}
+            self.mtimes = mtimes
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.INTERVAL if deadline is None else max(0, min(self.INTERVAL, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+def make_watcher(directory, names):
+    try:
+        return InotifyWatcher(directory, names)
+    except (OSError, AttributeError):
+        # no inotify (not linux, or no libc we can find)
+        return PollingWatcher(directory, names)
+
+def wait_debounced(watcher, debounce):
+    """Wait for a change, then keep collecting changes until debounce seconds pass without any."""
+    changed = watcher.wait()
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more